@@ -0,0 +1,96 @@
+# Vote-timeline analytics of a whole day of posts, from the raw votes to the histograms, cumulative curves, velocity
+# and ranks of ph_py.analytics, timed against the same computation done vote by vote in Python. The exit status is 1
+# if the vectorized one takes longer than --budget seconds.
+#
+#   python benchmarks/bench_analytics.py [--posts 50] [--votes 200000] [--bin minute] [--budget 1.0]
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ph_py.analytics import BINS  # noqa: E402
+from ph_py.analytics import VoteTimelines  # noqa: E402
+from ph_py.pagination import parse_timestamp  # noqa: E402
+
+DAY = "2015-06-01T%02d:%02d:%02d.%03d-07:00"
+
+
+def day_votes(n_posts, n_votes, seed=0):
+    # {post id: raw votes} of a day, a few posts getting most of the votes as on a real launch day
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(n_posts)]
+    posts = dict((post_id, []) for post_id in range(1, n_posts + 1))
+    for vote_id, post_id in enumerate(rng.choices(list(posts), weights, k=n_votes)):
+        hour = min(23, int(rng.expovariate(1 / 6.0)))
+        created_at = DAY % (hour, rng.randint(0, 59), rng.randint(0, 59), rng.randint(0, 999))
+        posts[post_id].append({"id": vote_id, "created_at": created_at, "post_id": post_id, "user_id": vote_id})
+    return posts
+
+
+def vectorized(posts, bin):
+    timelines = VoteTimelines.from_votes(posts, bin)
+    return timelines.counts, timelines.cumulative, timelines.velocity(60), timelines.ranks()
+
+
+def pure_python(posts, bin):
+    # the same counts, cumulative curves and ranks, vote by vote
+    step = BINS[bin] / 1000.0
+    seconds = dict((post_id, [parse_timestamp(vote["created_at"]).astimezone(timezone.utc).timestamp()
+                              for vote in votes]) for post_id, votes in posts.items())
+    first = min(min(times) for times in seconds.values() if times)
+    first -= first % step
+    n_bins = int((max(max(times) for times in seconds.values() if times) - first) // step) + 1
+    counts = {}
+    for post_id, times in seconds.items():
+        row = counts[post_id] = [0] * n_bins
+        for second in times:
+            row[int((second - first) // step)] += 1
+    cumulative = {}
+    for post_id, row in counts.items():
+        total = 0
+        cumulative[post_id] = curve = []
+        for count in row:
+            total += count
+            curve.append(total)
+    ranks = []
+    for column in range(n_bins):
+        ranks.append(sorted(cumulative, key=lambda post_id: -cumulative[post_id][column]))
+    return counts, cumulative, ranks
+
+
+def best(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=50, help="posts of the day")
+    parser.add_argument("--votes", type=int, default=200000, help="votes of the day, across all of its posts")
+    parser.add_argument("--bin", default="minute", choices=sorted(BINS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds allowed to the vectorized analytics")
+    args = parser.parse_args()
+
+    posts = day_votes(args.posts, args.votes)
+    fast = best(lambda: vectorized(posts, args.bin), args.repeat)
+    slow = best(lambda: pure_python(posts, args.bin), 1)
+    print("%d posts, %d votes, by %s" % (args.posts, args.votes, args.bin))
+    print("%-14s %10.3f s" % ("vectorized", fast))
+    print("%-14s %10.3f s  (%.1fx)" % ("pure Python", slow, slow / fast))
+    if fast > args.budget:
+        print("OVER BUDGET (%.3f s)" % args.budget)
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Throughput and peak memory of exporting votes to NumPy and Parquet chunk by chunk, compared with converting them
+# row by row into a list of dicts loaded into an Arrow table.
+#
+# Timestamps alone are parsed once by pyarrow and once by numpy, the two parsers of export.parse_timestamps.
+#
+#   python benchmarks/bench_export.py [--votes 1000000] [--chunk-size 100000]
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fixtures  # noqa: E402
+from ph_py import export  # noqa: E402
+
+
+def stream(n, chunk_size, page=fixtures.votes(10000)):
+    # n votes as they would come from iter_post_votes, never held in memory all at once
+    for start in range(0, n, len(page)):
+        for vote in page[:n - start]:
+            yield vote
+
+
+def row_by_row(n, chunk_size):
+    # the list of dicts with parsed datetimes that used to be loaded into a table in one go
+    import pyarrow
+
+    rows = [dict(vote, created_at=datetime.fromisoformat(vote["created_at"])) for vote in stream(n, chunk_size)]
+    return pyarrow.Table.from_pylist(rows).num_rows
+
+
+def numpy_chunks(n, chunk_size):
+    return sum(len(array) for array in export.iter_numpy(stream(n, chunk_size), "votes", chunk_size))
+
+
+def parquet(n, chunk_size):
+    with tempfile.TemporaryDirectory() as directory:
+        return export.write_parquet(stream(n, chunk_size), os.path.join(directory, "votes.parquet"), "votes",
+                                    chunk_size)
+
+
+def timestamps(n):
+    values = [vote["created_at"] for vote in stream(n, n)]
+    for name, pyarrow in (("pyarrow", export._optional_pyarrow), ("numpy", lambda: None)):
+        with mock.patch.object(export, "_optional_pyarrow", pyarrow):
+            started = time.perf_counter()
+            export.parse_timestamps(values)
+            elapsed = time.perf_counter() - started
+        print("%-12s %10.2f %14.0f" % (name, elapsed, n / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--votes", type=int, default=1000000)
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    args = parser.parse_args()
+
+    print("%-12s %10s %14s %14s" % ("export", "time (s)", "votes/s", "peak alloc MB"))
+    for name, run in (("row by row", row_by_row), ("numpy", numpy_chunks), ("parquet", parquet)):
+        started = time.perf_counter()
+        rows = run(args.votes, args.chunk_size)
+        elapsed = time.perf_counter() - started
+        # memory is measured on a second run, tracemalloc slows the first one down too much to time it
+        tracemalloc.start()
+        run(args.votes, args.chunk_size)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("%-12s %10.2f %14.0f %14.1f" % (name, elapsed, rows / elapsed, peak / 1024.0 / 1024.0))
+
+    print("\n%-12s %10s %14s" % ("timestamps", "time (s)", "strings/s"))
+    timestamps(args.votes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Import time of the package measured with `python -X importtime` in fresh interpreters, checked against a budget:
+# the exit status is 1 if an import goes over its budget, or if `import ph_py` loads a module it should leave to
+# first use (requests, aiohttp, asyncio).
+#
+#   python benchmarks/bench_import.py [--runs 7] [--budget ph_py=20] [--budget ph_py.product_hunt_client=60]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# milliseconds allowed to each import, the median of the runs counts
+BUDGETS = {
+    "ph_py": 20.0,
+    "ph_py.product_hunt_client": 60.0,
+    "ph_py.helpers": 20.0,
+}
+# modules that `import ph_py` must not load
+DEFERRED = ("requests", "aiohttp", "asyncio")
+
+
+def importtime(statement):
+    # {module: (self µs, cumulative µs, nesting level)} of the modules imported by the statement
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT, stderr=subprocess.PIPE,
+                            universal_newlines=True, check=True).stderr
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue
+        level = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(own), int(cumulative), level)
+    return modules
+
+
+def import_ms(module, startup):
+    # the cumulative time of the top-level imports done by `import module`, past those of the interpreter startup
+    modules = importtime("import %s" % module)
+    return sum(cumulative for name, (_, cumulative, level) in modules.items()
+               if level == 0 and name not in startup) / 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULE=MS",
+                        help="budget of an import in milliseconds, replacing its default")
+    args = parser.parse_args()
+
+    budgets = dict(BUDGETS)
+    for budget in args.budget:
+        module, _, ms = budget.partition("=")
+        budgets[module] = float(ms)
+
+    startup = set(importtime("pass"))
+    failures = []
+    print("%-28s %10s %10s %10s" % ("import", "median ms", "best ms", "budget ms"))
+    for module, budget in sorted(budgets.items()):
+        times = [import_ms(module, startup) for _ in range(args.runs)]
+        median = statistics.median(times)
+        print("%-28s %10.1f %10.1f %10.1f%s" % (module, median, min(times), budget,
+                                                "  OVER BUDGET" if median > budget else ""))
+        if median > budget:
+            failures.append(module)
+
+    loaded = subprocess.run([sys.executable, "-c", "import sys, ph_py; print(' '.join(sorted(sys.modules)))"],
+                            cwd=ROOT, stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout.split()
+    eager = [module for module in DEFERRED if module in loaded]
+    if eager:
+        print("import ph_py loads %s" % ", ".join(eager))
+        failures.append("ph_py")
+
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Memory held by parsed votes, followers, users and posts, compared with the dict/__dict__ based objects they replaced.
+#
+#   python benchmarks/bench_memory.py [--n 200000]
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fixtures  # noqa: E402
+from ph_py import helpers  # noqa: E402
+from ph_py.models.post import Post  # noqa: E402
+from ph_py.models.user import User  # noqa: E402
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size, len(objects)
+
+
+# baselines: the previous representations
+def dict_votes(votes):
+    return [{"id": v["id"], "created_at": v["created_at"], "post_id": v["post_id"], "user_id": v["user_id"]}
+            for v in votes]
+
+
+def dict_followers(users):
+    return [{"id": u["user"]["id"], "created_at": u["created_at"], "name": u["user"]["name"],
+             "username": u["user"]["username"]} for u in users]
+
+
+def with_dict(cls):
+    # the same class without __slots__, each instance gets its own __dict__ again
+    return type(cls.__name__ + "WithDict", (object,), {"__init__": cls.__init__})
+
+
+def unslotted_users(users, cls=with_dict(User)):
+    return [cls(u["id"], u["name"], u["headline"], u["created_at"], u["username"], u["image_url"], u["profile_url"],
+                u["twitter_username"], u["website_url"]) for u in users]
+
+
+def unslotted_posts(posts, cls=with_dict(Post)):
+    return [cls(p["id"], p["name"], p["tagline"], p["created_at"], p["day"], p["comments_count"], p["votes_count"],
+                p["discussion_url"], p["redirect_url"], p["screenshot_url"], p["maker_inside"], p["user"],
+                p["current_user"]) for p in posts]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200000, help="number of votes and followers")
+    args = parser.parse_args()
+
+    votes = fixtures.votes(args.n)
+    followers = fixtures.followers(args.n // 4)
+    users = [fixtures.user(i) for i in range(args.n // 10)]
+    posts = fixtures.posts(args.n // 20)
+
+    cases = [
+        ("votes", lambda: dict_votes(votes), lambda: helpers.parse_votes(votes)),
+        ("followers", lambda: dict_followers(followers), lambda: helpers.parse_followings_or_followers(followers)),
+        ("users", lambda: unslotted_users(users), lambda: helpers.parse_users(users)),
+        ("posts", lambda: unslotted_posts(posts), lambda: helpers.parse_posts(posts)),
+    ]
+    print("%-10s %10s %14s %14s %10s" % ("objects", "count", "before B/obj", "after B/obj", "saved"))
+    for name, before, after in cases:
+        before_size, count = measure(before)
+        after_size, _ = measure(after)
+        print("%-10s %10d %14.1f %14.1f %9.0f%%" % (name, count, before_size / float(count), after_size / float(count),
+                                                   100.0 * (before_size - after_size) / before_size))
+
+
+if __name__ == "__main__":
+    main()
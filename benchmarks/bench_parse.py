@@ -0,0 +1,62 @@
+# Parse time and allocations of parse_posts when the nested collections of a Post are only parsed on access,
+# compared with touching all of them (what every Post construction used to do).
+#
+#   python benchmarks/bench_parse.py [--posts 2000] [--repeat 5]
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fixtures  # noqa: E402
+from ph_py.helpers import parse_posts  # noqa: E402
+
+LAZY_FIELDS = ("user", "comments", "votes", "related_links", "install_links", "makers", "platforms", "topics",
+               "external_links", "badges", "related_posts", "media")
+
+
+def read_summary(posts):
+    for post in posts:
+        post.name, post.votes_count, post.day
+
+
+def read_everything(posts):
+    for post in posts:
+        for field in LAZY_FIELDS:
+            getattr(post, field)
+
+
+def run(payload, read):
+    posts = parse_posts(payload)
+    read(posts if isinstance(posts, list) else [posts])
+
+
+def allocated(payload, read):
+    tracemalloc.start()
+    run(payload, read)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=2000, help="posts in the day list")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("get_details_of_post", fixtures.post(1, detailed=True, n_votes=500, n_comments=100), 20),
+        ("get_specific_days_posts", fixtures.posts(args.posts), 1),
+    ]
+    print("%-24s %-8s %12s %14s" % ("payload", "access", "time (ms)", "peak alloc KB"))
+    for name, payload, number in cases:
+        for label, read in (("all", read_everything), ("summary", read_summary)):
+            best = min(timeit.repeat(lambda: run(payload, read), number=number, repeat=args.repeat)) / number
+            print("%-24s %-8s %12.3f %14.1f" % (name, label, best * 1000, allocated(payload, read) / 1024.0))
+
+
+if __name__ == "__main__":
+    main()
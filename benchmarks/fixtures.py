@@ -0,0 +1,165 @@
+# Realistic synthetic payloads shaped like the responses of the Product Hunt v1 API
+import random
+
+CREATED_AT = "2015-%02d-%02dT%02d:%02d:%02d.%03d-08:00"
+
+
+def created_at(rng):
+    return CREATED_AT % (rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23), rng.randint(0, 59),
+                         rng.randint(0, 59), rng.randint(0, 999))
+
+
+def user(user_id, rng=None):
+    rng = rng or random.Random(user_id)
+    return {
+        "id": user_id,
+        "name": "User %d" % user_id,
+        "headline": "Maker of things #%d" % rng.randint(1, 1000),
+        "created_at": created_at(rng),
+        "username": "user%d" % user_id,
+        "image_url": {"original": "https://ph-avatars.imgix.net/%d/original" % user_id},
+        "profile_url": "https://www.producthunt.com/@user%d" % user_id,
+        "twitter_username": "user%d" % user_id,
+        "website_url": "https://user%d.example.com" % user_id
+    }
+
+
+def user_details(user_id, votes_count=0, followers_count=0, followings_count=0):
+    details = user(user_id)
+    details.update({
+        "collections_count": 0,
+        "followed_topics_count": 3,
+        "followers": [],
+        "followers_count": followers_count,
+        "followings": [],
+        "followings_count": followings_count,
+        "header_image_url": None,
+        "maker_of": [],
+        "maker_of_count": 0,
+        "posts": [],
+        "posts_count": 0,
+        "votes": [],
+        "votes_count": votes_count
+    })
+    return details
+
+
+def vote(vote_id, post_id=None, user_id=None, rng=None):
+    rng = rng or random.Random(vote_id)
+    return {
+        "id": vote_id,
+        "created_at": created_at(rng),
+        "user_id": user_id if user_id is not None else rng.randint(1, 10 ** 6),
+        "post_id": post_id if post_id is not None else rng.randint(1, 10 ** 5)
+    }
+
+
+def votes(n, post_id=None, user_id=None, seed=0):
+    rng = random.Random(seed)
+    return [vote(n - i, post_id, user_id, rng) for i in range(n)]
+
+
+def follower(follower_id, rng=None):
+    rng = rng or random.Random(follower_id)
+    return {"id": follower_id, "created_at": created_at(rng), "user": user(rng.randint(1, 10 ** 6), rng)}
+
+
+def followers(n, seed=0):
+    rng = random.Random(seed)
+    return [follower(n - i, rng) for i in range(n)]
+
+
+def comment(comment_id, post_id, parent_comment_id=None, children=(), rng=None):
+    rng = rng or random.Random(comment_id)
+    user_id = rng.randint(1, 10 ** 6)
+    return {
+        "id": comment_id,
+        "body": "This is comment %d, congrats on the launch!" % comment_id,
+        "created_at": created_at(rng),
+        "post_id": post_id,
+        "parent_comment_id": parent_comment_id,
+        "user_id": user_id,
+        "child_comments_count": len(children),
+        "maker": rng.random() < 0.1,
+        "user": user(user_id, rng),
+        "child_comments": list(children)
+    }
+
+
+def comments(n, post_id=1, depth=3, fanout=2, seed=0):
+    # n top-level comments, each with a reply tree `depth` levels deep and `fanout` replies per comment
+    rng = random.Random(seed)
+    next_id = [n * (fanout ** (depth + 1))]
+
+    def build(parent_id, level):
+        if level == depth:
+            return []
+        children = []
+        for _ in range(fanout):
+            next_id[0] += 1
+            comment_id = next_id[0]
+            children.append(comment(comment_id, post_id, parent_id, build(comment_id, level + 1), rng))
+        return children
+
+    return [comment(n - i, post_id, None, build(n - i, 0), rng) for i in range(n)]
+
+
+def post(post_id, day="2015-06-01", detailed=False, n_votes=20, n_comments=10, rng=None):
+    rng = rng or random.Random(post_id)
+    maker = user(rng.randint(1, 10 ** 6), rng)
+    p = {
+        "id": post_id,
+        "name": "Product %d" % post_id,
+        "tagline": "The best product number %d" % post_id,
+        "created_at": created_at(rng),
+        "day": day,
+        "comments_count": n_comments,
+        "votes_count": rng.randint(0, 2000),
+        "discussion_url": "https://www.producthunt.com/posts/product-%d" % post_id,
+        "redirect_url": "https://www.producthunt.com/r/%d" % post_id,
+        "screenshot_url": {"300px": "https://url2png.example/%d/300" % post_id,
+                           "850px": "https://url2png.example/%d/850" % post_id},
+        "maker_inside": True,
+        "user": maker,
+        "current_user": {"voted_for_post": False, "commented_on_post": False}
+    }
+    if not detailed:
+        return p
+
+    p.update({
+        "comments": comments(n_comments, post_id, depth=2, seed=post_id),
+        "votes": votes(n_votes, post_id, seed=post_id),
+        "related_links": [{"id": post_id * 10 + i, "url": "https://blog.example/%d" % i, "title": "Review %d" % i,
+                           "domain": "blog.example", "favicon": None, "post_id": post_id, "user_id": maker["id"]}
+                          for i in range(3)],
+        "install_links": [{"platform": "ios", "created_at": created_at(rng),
+                           "redirect_url": "https://apps.example/%d" % post_id, "post_id": post_id}],
+        "related_posts": [{"id": post_id + i} for i in range(1, 6)],
+        "media": [{"id": post_id * 100 + i, "kindle_asin": None, "media_type": "image", "priority": i,
+                   "platform": None, "video_id": None, "original_width": 1280, "original_height": 800,
+                   "image_url": "https://ph-files.imgix.net/%d-%d.png" % (post_id, i), "metadata": {"url": None}}
+                  for i in range(4)],
+        "description": "A longer description of product %d. " % post_id * 5,
+        "topics": [{"id": i, "name": "Topic %d" % i, "slug": "topic-%d" % i} for i in range(3)],
+        "external_links": [{"id": i, "title": "Article %d" % i, "description": "", "author": "Someone",
+                            "source": "news.example", "url": "https://news.example/%d" % i,
+                            "favicon_image_uuid": None, "link_type": "article"} for i in range(2)],
+        "featured": True,
+        "exclusive": None,
+        "product_state": "default",
+        "category_id": 1,
+        "badges": [{"id": post_id, "type": "TopPostBadge",
+                    "data": {"date": day, "period": "daily", "position": rng.randint(1, 10)}}],
+        "reviews_count": 0,
+        "positive_reviews_count": 0,
+        "negative_reviews_count": 0,
+        "neutral_reviews_count": 0,
+        "makers": [maker, user(rng.randint(1, 10 ** 6), rng)],
+        "platforms": []
+    })
+    return p
+
+
+def posts(n, day="2015-06-01", detailed=False, seed=0):
+    rng = random.Random(seed)
+    return [post(n - i, day, detailed, rng=rng) for i in range(n)]
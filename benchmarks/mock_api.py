@@ -0,0 +1,209 @@
+# A local stand-in for the Product Hunt v1 API serving the fixture payloads over real HTTP, with the rate-limit
+# headers of the real one and an injectable latency. Used by benchmarks/run.py, it can also be started on its own
+# to point a client at it:
+#
+#   python benchmarks/mock_api.py [--port 8000] [--latency 0.05] [--post-votes 1000]
+#   ProductHuntClient.API_BASE = "http://127.0.0.1:8000/v1/"
+import argparse
+import collections
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+MAX_PER_PAGE = 100
+
+
+class MockAPI(object):
+    """ Serves posts, posts/<id>, posts/<id>/votes, posts/<id>/comments, users/<name>, users/<id>/votes|followers|
+    following, me and oauth/token. Post <id> has `post_votes` votes and `post_comments` top-level comments, user
+    `user<id>` has `user_votes` votes, `user_followers` followers and `user_followings` followings. """
+
+    def __init__(self, latency=0.0, jitter=0.0, day_posts=50, post_votes=1000, post_comments=200, user_votes=500,
+                 user_followers=500, user_followings=100, rate_limit=10 ** 6, reset_in=900, port=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.day_posts = day_posts
+        self.post_votes = post_votes
+        self.post_comments = post_comments
+        self.user_votes = user_votes
+        self.user_followers = user_followers
+        self.user_followings = user_followings
+        self.rate_limit = rate_limit
+        self.reset_in = reset_in
+        self.port = port
+        # route with the ids replaced by ":id" -> calls served
+        self.calls = collections.Counter()
+        self.remaining = rate_limit
+        self.server = None
+        self._lock = threading.Lock()
+        # fixtures and encoded bodies built once, so that generating them doesn't count as time spent by the client
+        self._cached = {}
+
+    @property
+    def base(self):
+        return "http://127.0.0.1:%d/v1/" % self.server.server_address[1]
+
+    def start(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, without TCP_NODELAY a keep-alive client waits for the
+            # delayed ACK (~40ms) on every response
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def handle_one(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode("utf-8") if length else ""
+                path, _, query = self.path.partition("?")
+                params = dict(parse_qsl(query))
+                params.update(parse_qsl(body))
+                status, content, headers = api.respond(self.command, path.split("/v1/", 1)[-1], params)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = handle_one
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.base
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def respond(self, method, route, params):
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+        parts = route.split("/")
+        with self._lock:
+            self.calls["%s %s" % (method, "/".join(":id" if part.isdigit() else part for part in parts))] += 1
+            self.remaining = max(0, self.remaining - 1)
+            headers = [("X-Rate-Limit-Limit", str(self.rate_limit)),
+                       ("X-Rate-Limit-Remaining", str(self.remaining)),
+                       ("X-Rate-Limit-Reset", str(self.reset_in))]
+        try:
+            payload = self.route(method, parts, params)
+        except (KeyError, ValueError):
+            payload = None
+        if payload is None:
+            return 404, json.dumps({"error": "not_found", "error_description": "Not found"}).encode("utf-8"), headers
+        return 200, payload, headers
+
+    def cached(self, key, build):
+        value = self._cached.get(key)
+        if value is None:
+            value = self._cached[key] = build()
+        return value
+
+    def body(self, key, build):
+        return self.cached(key, lambda: json.dumps(build()).encode("utf-8"))
+
+    def route(self, method, parts, params):
+        if parts == ["oauth", "token"]:
+            return json.dumps({"access_token": "mock-token", "token_type": "bearer", "scope": "public private"}
+                              ).encode("utf-8")
+        if method != "GET":
+            return None
+
+        if parts == ["posts"]:
+            day = params.get("day", "2015-06-01")
+            return self.body(("posts", day), lambda: {"posts": fixtures.posts(self.day_posts, day)})
+        if parts[0] == "posts" and len(parts) == 2:
+            post_id = int(parts[1])
+            return self.body(("post", post_id), lambda: {"post": fixtures.post(post_id, detailed=True)})
+        if parts[0] == "posts" and len(parts) == 3 and parts[2] == "votes":
+            votes = self.cached(("votes", parts[1]), lambda: fixtures.votes(self.post_votes, int(parts[1])))
+            return self.older_page("votes", votes, params)
+        if parts[0] == "posts" and len(parts) == 3 and parts[2] == "comments":
+            comments = self.cached(("comments", parts[1]),
+                                   lambda: fixtures.comments(self.post_comments, int(parts[1]), depth=2))
+            return self.older_page("comments", comments, params)
+        if parts == ["me"]:
+            return self.body("me", lambda: {"user": dict(fixtures.user_details(1), email="user1@example.com",
+                                                         role="user", permissions={"can_vote_posts": True},
+                                                         notifications={"unseen_count": 0}, first_time_user=False)})
+
+        if parts[0] == "users" and len(parts) == 2:
+            user_id = int(parts[1][4:]) if parts[1].startswith("user") else int(parts[1])
+            return self.body(("user", user_id), lambda: {"user": fixtures.user_details(
+                user_id, self.user_votes, self.user_followers, self.user_followings)})
+        if parts[0] == "users" and len(parts) == 3:
+            if parts[2] == "votes":
+                items = self.cached(("user votes", parts[1]),
+                                    lambda: fixtures.votes(self.user_votes, user_id=int(parts[1])))
+            else:
+                total = self.user_followers if parts[2] == "followers" else self.user_followings
+                items = self.cached(parts[2], lambda: fixtures.followers(total))
+            if "newer" in params:
+                items = [item for item in items if item["id"] > int(params["newer"])]
+            # page-numbered, unlike the older/newer endpoints
+            per_page = min(int(params.get("per_page", 50)), MAX_PER_PAGE)
+            first = (int(params.get("page", 1)) - 1) * per_page
+            return json.dumps({parts[2]: items[first:first + per_page]}).encode("utf-8")
+        return None
+
+    @staticmethod
+    def older_page(key, items, params):
+        # the records of an older/newer endpoint have the ids len(items)..1, newest first
+        total = len(items)
+        per_page = min(int(params.get("per_page", 100)), MAX_PER_PAGE)
+        first = total - min(int(params.get("older", total + 1)) - 1, total)
+        last = min(first + per_page, total - int(params.get("newer", 0)))
+        return json.dumps({key: items[first:last]}).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8000, help="0 picks a free port")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random seconds added on top of the latency")
+    parser.add_argument("--day-posts", type=int, default=50)
+    parser.add_argument("--post-votes", type=int, default=1000)
+    parser.add_argument("--post-comments", type=int, default=200)
+    parser.add_argument("--user-votes", type=int, default=500)
+    parser.add_argument("--user-followers", type=int, default=500)
+    parser.add_argument("--user-followings", type=int, default=100)
+    args = parser.parse_args()
+
+    api = MockAPI(args.latency, args.jitter, args.day_posts, args.post_votes, args.post_comments, args.user_votes,
+                  args.user_followers, args.user_followings, port=args.port)
+    # benchmarks/run.py reads the address from this line
+    print("Serving the mock Product Hunt API at %s" % api.start(), flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# The benchmark suite: runs the client against the mock API of benchmarks/mock_api.py, started in its own process so
+# that serving doesn't compete with the client for the GIL, and measures end-to-end throughput, pagination latency,
+# parse throughput and memory. Results can be saved as JSON and compared with a previous run, in which case the exit
+# status is 1 if any of them got worse by more than --tolerance.
+#
+#   python benchmarks/run.py [--latency 0.002] [--output results.json] [--compare baseline.json] [--tolerance 0.25]
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import fixtures  # noqa: E402
+from ph_py import ProductHuntClient  # noqa: E402
+from ph_py.helpers import parse_comments  # noqa: E402
+from ph_py.helpers import parse_posts  # noqa: E402
+
+
+class Results(object):
+
+    def __init__(self):
+        self.results = {}
+
+    def add(self, name, value, unit, higher_is_better):
+        self.results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+        print("%-34s %14.2f %s" % (name, value, unit))
+
+
+def start_mock_api(args):
+    command = [sys.executable, os.path.join(HERE, "mock_api.py"), "--port", "0", "--latency", str(args.latency),
+               "--day-posts", str(args.day_posts), "--post-votes", str(args.post_votes),
+               "--post-comments", str(args.post_comments), "--user-votes", str(args.user_votes)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, universal_newlines=True)
+    line = process.stdout.readline()
+    if not line:
+        raise RuntimeError("The mock API failed to start")
+    return process, line.split()[-1]
+
+
+def best(function, repeat, autorange=False):
+    # seconds taken by the fastest call; autorange loops quick functions for 0.2s at least, to time them reliably
+    timer = timeit.Timer(function)
+    number = timer.autorange()[0] if autorange else 1
+    return min(timer.repeat(number=number, repeat=repeat)) / number
+
+
+def peak_memory(function):
+    gc.collect()
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024.0
+
+
+def run_client(client, results, args):
+    # end to end: many threads sharing a client, each call a distinct post so that nothing is coalesced
+    ids = range(1, args.requests + 1)
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        # a first pass has the mock API build its payloads, and opens the connections
+        list(executor.map(client.get_details_of_post, ids))
+        elapsed = best(lambda: list(executor.map(client.get_details_of_post, ids)), args.repeat)
+    results.add("details_of_post_throughput", args.requests / elapsed, "requests/s", True)
+    results.add("todays_posts_latency", best(client.get_todays_posts, args.repeat) * 1000, "ms", False)
+
+    pages = -(-args.post_votes // 100)
+    elapsed = best(lambda: list(client.iter_post_votes(1)), args.repeat)
+    results.add("post_votes_pagination", elapsed * 1000, "ms", False)
+    results.add("post_votes_page_latency", elapsed * 1000 / pages, "ms/page", False)
+    elapsed = best(lambda: client.get_user_votes(1, per_page=100, count=args.user_votes), args.repeat)
+    results.add("user_votes_parallel_pagination", elapsed * 1000, "ms", False)
+    elapsed = best(lambda: client.get_full_comment_thread(1), args.repeat)
+    results.add("comment_thread_pagination", elapsed * 1000, "ms", False)
+
+    results.add("post_votes_walk_peak_memory", peak_memory(lambda: sum(1 for _ in client.iter_post_votes(1))), "KB",
+                False)
+    results.add("user_details_peak_memory", peak_memory(lambda: client.get_details_of_user("user1")), "KB", False)
+
+
+def run_parse(results, args):
+    posts = fixtures.posts(args.parse_posts, detailed=True)
+    elapsed = best(lambda: parse_posts(posts), args.repeat, True)
+    results.add("parse_posts_throughput", len(posts) / elapsed, "posts/s", True)
+    results.add("parse_posts_peak_memory", peak_memory(lambda: parse_posts(posts)), "KB", False)
+
+    comments = fixtures.comments(args.parse_comments, depth=3, fanout=2)
+    total = len(comments) * (2 ** 4 - 1)
+    elapsed = best(lambda: parse_comments(comments), args.repeat, True)
+    results.add("parse_comments_throughput", total / elapsed, "comments/s", True)
+    results.add("parse_comments_peak_memory", peak_memory(lambda: parse_comments(comments)), "KB", False)
+
+
+def compare(results, baseline, tolerance):
+    # prints the change of every result against the baseline, returns the names of those that got worse
+    regressions = []
+    print("\n%-34s %14s %14s %9s" % ("compared with baseline", "baseline", "now", "change"))
+    for name, result in sorted(results.items()):
+        before = baseline.get(name)
+        if before is None or not before["value"]:
+            continue
+        change = result["value"] / before["value"] - 1
+        worse = -change if result["higher_is_better"] else change
+        flag = ""
+        if worse > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print("%-34s %14.2f %14.2f %+8.1f%%%s" % (name, before["value"], result["value"], change * 100, flag))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds the mock API takes to answer")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="calls of the end-to-end throughput test")
+    parser.add_argument("--day-posts", type=int, default=50)
+    parser.add_argument("--post-votes", type=int, default=2000)
+    parser.add_argument("--post-comments", type=int, default=300)
+    parser.add_argument("--user-votes", type=int, default=1000)
+    parser.add_argument("--parse-posts", type=int, default=500, help="detailed posts in the parse test")
+    parser.add_argument("--parse-comments", type=int, default=2000, help="top-level comments in the parse test")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each timing, the best one is kept")
+    parser.add_argument("--output", help="file to save the results to, as JSON")
+    parser.add_argument("--compare", help="results saved by a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="relative change counted as a regression")
+    args = parser.parse_args()
+
+    results = Results()
+    process, base = start_mock_api(args)
+    try:
+        ProductHuntClient.API_BASE = base
+        with ProductHuntClient("id", "secret", "http://localhost", pool_maxsize=args.threads) as client:
+            run_client(client, results, args)
+    finally:
+        process.terminate()
+        process.wait()
+    run_parse(results, args)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(), "args": vars(args),
+                       "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results.results}, output, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline:
+            if compare(results.results, json.load(baseline)["results"], args.tolerance):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# Shares one ProductHuntClient between many threads against a fake in-process API whose client token expires every
+# --expire-every calls, and checks that every call gets its own response back and that each expiry costs exactly one
+# token refresh at most, however many threads hit the 401 together.
+#
+#   python benchmarks/stress_threads.py [--threads 32] [--calls 20000] [--expire-every 500]
+import argparse
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ph_py import ProductHuntClient  # noqa: E402
+
+
+class FakeResponse(object):
+
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode("utf-8")
+        # a budget large enough for the rate limiter never to make the threads wait
+        self.headers = {"X-Rate-Limit-Remaining": "1000000", "X-Rate-Limit-Reset": "900"}
+
+
+class FakeAPI(object):
+    """ Stands in for the requests session: answers every GET with its route, and expires the token on schedule """
+
+    def __init__(self, expire_every, latency):
+        self.expire_every = expire_every
+        self.latency = latency
+        self.tokens = itertools.count(1)
+        self.token = None
+        self.calls = 0
+        self.refreshes = 0
+        self.expiries = 0
+        self.unauthorized = 0
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        time.sleep(self.latency)
+        with self._lock:
+            if url.endswith("oauth/token"):
+                self.refreshes += 1
+                self.token = "token-%d" % next(self.tokens)
+                return FakeResponse(200, {"access_token": self.token})
+
+            if headers.get("Authorization") != "Bearer %s" % self.token:
+                self.unauthorized += 1
+                return FakeResponse(401, {"error": "unauthorized", "error_description": "expired token"})
+            self.calls += 1
+            if self.calls % self.expire_every == 0:
+                self.expiries += 1
+                self.token = None
+            return FakeResponse(200, {"route": url.rsplit("/", 1)[1]})
+
+    def get(self, url, headers=None, data=None):
+        return self.request("GET", url, headers, data)
+
+    def delete(self, url, headers=None, params=None, timeout=None):
+        return self.request("DELETE", url, headers, params)
+
+    def close(self):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--expire-every", type=int, default=500, help="calls served before the token expires")
+    parser.add_argument("--latency", type=float, default=0.0005, help="seconds taken by every fake call")
+    args = parser.parse_args()
+
+    api = FakeAPI(args.expire_every, args.latency)
+
+    class Client(ProductHuntClient):
+        API_BASE = "https://fake.api/v1/"
+
+        @staticmethod
+        def build_session(pool_connections, pool_maxsize, keep_alive):
+            return api
+
+    # no coalescing: every call has to make its own request for the counts below to mean something
+    client = Client("id", "secret", "http://localhost", single_flight=False)
+
+    def call(i):
+        return client.make_request("GET", "users/%d" % i, None, "client")["route"] == str(i)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        correct = sum(executor.map(call, range(args.calls)))
+    elapsed = time.perf_counter() - started
+
+    print("calls: %d in %.2fs with %d threads, %d got their own response" % (args.calls, elapsed, args.threads,
+                                                                              correct))
+    print("token expiries: %d, refreshes: %d (1 initial), 401s: %d" % (api.expiries, api.refreshes,
+                                                                       api.unauthorized))
+    assert correct == args.calls, "some calls got a wrong or missing response"
+    # the last expiry may come with the last call, and never need a refresh
+    assert api.refreshes <= api.expiries + 1, "expected at most one refresh per expiry"
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
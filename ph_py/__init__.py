@@ -1 +1,35 @@
-from .product_hunt_client import ProductHuntClient
+from . import helpers  # noqa: F401 (imports the models in the order their circular imports need)
+from .models.badges import Badge
+from .models.comment import Comment
+from .models.comment_forest import CommentForest
+from .models.external_link import ExternalLink
+from .models.follower import Follower
+from .models.install_link import InstallLink
+from .models.media import Media
+from .models.notification import Notification
+from .models.post import Post
+from .models.related_link import RelatedLink
+from .models.topics import Topic
+from .models.user import User
+from .models.user_details import UserDetails
+from .models.vote import Vote
+
+# the clients pull in requests and aiohttp, which make up most of the import time: they are only imported on first use
+_LAZY = {
+    "ProductHuntClient": "product_hunt_client",
+    "AsyncProductHuntClient": "async_client"
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+
+        value = getattr(importlib.import_module("." + _LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
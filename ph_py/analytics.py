@@ -0,0 +1,193 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from .export import extract
+from .export import parse_timestamps
+from .pagination import MAX_PER_PAGE
+
+# numpy is required (pip install ph_py[analytics]): votes are counted, accumulated and ranked on whole arrays, so that
+# the cost of a day of votes is that of parsing their timestamps
+
+# milliseconds of the named bins; any other bin is given in seconds
+BINS = {"second": 1000, "minute": 60 * 1000, "hour": 60 * 60 * 1000, "day": 24 * 60 * 60 * 1000}
+
+CREATED_AT = (("created_at", "timestamp", "created_at"),)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("Vote analytics require numpy, install it with: pip install ph_py[analytics]")
+    return numpy
+
+
+def _step(bin):
+    # milliseconds of a bin
+    if isinstance(bin, str):
+        if bin not in BINS:
+            raise ValueError("bin must be one of %s or a number of seconds, not %r" % (sorted(BINS), bin))
+        return BINS[bin]
+    step = int(bin * 1000)
+    if step <= 0:
+        raise ValueError("bin must be a positive number of seconds, not %r" % bin)
+    return step
+
+
+def _milliseconds(np, value):
+    # milliseconds since the epoch of an ISO 8601 string, a datetime or a datetime64
+    if isinstance(value, str):
+        value = parse_timestamps([value])[0]
+    return int(np.datetime64(value, "ms").astype(np.int64))
+
+
+def vote_times(votes):
+    # created_at of the votes, raw dicts or Vote models, as a sorted datetime64[ms] array in UTC; missing ones dropped
+    np = _numpy()
+    votes = votes if isinstance(votes, list) else list(votes)
+    if not votes:
+        return np.empty(0, dtype="datetime64[ms]")
+    times = parse_timestamps(extract(votes, CREATED_AT)["created_at"])
+    times = times[~np.isnat(times)]
+    times.sort()
+    return times
+
+
+class VoteTimelines(object):
+    """ Votes of several posts counted on a shared grid of time bins: counts[i, j] is the number of votes post_ids[i]
+    got in the bin starting at edges[j]. The votes cast before the first bin are kept in `before`, so that the
+    cumulative curves and the ranks count every vote of a post; those cast from `end` on are left out. """
+
+    def __init__(self, post_ids, edges, counts, before, step):
+        self.post_ids = post_ids
+        self.edges = edges
+        self.counts = counts
+        self.before = before
+        self.step = step
+
+    @classmethod
+    def from_votes(cls, votes_by_post, bin="hour", start=None, end=None):
+        # votes_by_post maps post ids to their votes, raw dicts or Vote models: the timestamps of all of them are
+        # parsed at once
+        np = _numpy()
+        lengths = [len(votes) for votes in votes_by_post.values()]
+        votes = [vote for post_votes in votes_by_post.values() for vote in post_votes]
+        times = parse_timestamps(extract(votes, CREATED_AT)["created_at"]) if votes else np.empty(0, "datetime64[ms]")
+        return cls._from_rows(np, list(votes_by_post), times, lengths, bin, start, end)
+
+    @classmethod
+    def from_times(cls, times_by_post, bin="hour", start=None, end=None):
+        # times_by_post maps post ids to vote times (datetime64 arrays, as vote_times returns them). The bins start at
+        # `start`, by default the bin of the first vote, and run up to `end`, by default past the last vote.
+        np = _numpy()
+        arrays = [np.asarray(times, dtype="datetime64[ms]") for times in times_by_post.values()]
+        times = np.concatenate(arrays) if arrays else np.empty(0, dtype="datetime64[ms]")
+        return cls._from_rows(np, list(times_by_post), times, [len(times) for times in arrays], bin, start, end)
+
+    @classmethod
+    def _from_rows(cls, np, post_ids, times, lengths, bin, start, end):
+        # times holds the votes of every post one after the other, lengths[i] of them for post_ids[i]
+        step = _step(bin)
+        post_ids = np.array(post_ids, dtype=np.int64)
+        rows = np.repeat(np.arange(len(lengths), dtype=np.int64), np.array(lengths, dtype=np.int64))
+        known = ~np.isnat(times)
+        milliseconds = times[known].astype(np.int64)
+        rows = rows[known]
+
+        if start is not None:
+            first = _milliseconds(np, start)
+        else:
+            first = int(milliseconds.min()) if len(milliseconds) else 0
+            first -= first % step
+        if end is not None:
+            last = _milliseconds(np, end)
+        else:
+            last = int(milliseconds.max()) + 1 if len(milliseconds) else first
+        n_bins = max(0, -(-(last - first) // step))
+
+        before = np.bincount(rows[milliseconds < first], minlength=len(post_ids))
+        inside = (milliseconds >= first) & (milliseconds < last)
+        cells = rows[inside] * n_bins + (milliseconds[inside] - first) // step
+        counts = np.bincount(cells, minlength=len(post_ids) * n_bins).reshape(len(post_ids), n_bins)
+        edges = (first + np.arange(n_bins, dtype=np.int64) * step).astype("datetime64[ms]")
+        return cls(post_ids, edges, counts, before, step)
+
+    def __len__(self):
+        return len(self.post_ids)
+
+    def index(self, post_id):
+        # the row of a post
+        rows = (self.post_ids == post_id).nonzero()[0]
+        if not len(rows):
+            raise KeyError(post_id)
+        return int(rows[0])
+
+    @property
+    def cumulative(self):
+        # votes of each post by the end of each bin
+        np = _numpy()
+        return np.cumsum(self.counts, axis=1) + self.before[:, None]
+
+    @property
+    def totals(self):
+        return self.counts.sum(axis=1) + self.before
+
+    def velocity(self, window=1, per="hour"):
+        # votes per `per` of each post over the `window` bins up to each bin, fewer in the first ones
+        np = _numpy()
+        n_posts, n_bins = self.counts.shape
+        cumulative = np.zeros((n_posts, n_bins + 1), dtype=np.int64)
+        np.cumsum(self.counts, axis=1, out=cumulative[:, 1:])
+        ends = np.arange(1, n_bins + 1)
+        starts = np.maximum(ends - window, 0)
+        return (cumulative[:, ends] - cumulative[:, starts]) * (float(_step(per)) / ((ends - starts) * self.step))
+
+    def ranks(self):
+        # rank of each post by its votes at the end of each bin, 1 for the most voted; ties go to the earlier row
+        np = _numpy()
+        n_posts, n_bins = self.counts.shape
+        order = np.argsort(-self.cumulative, axis=0, kind="stable")
+        ranks = np.empty((n_posts, n_bins), dtype=np.int64)
+        np.put_along_axis(ranks, order, np.arange(1, n_posts + 1, dtype=np.int64)[:, None], axis=0)
+        return ranks
+
+    def leaders(self):
+        # the id of the most voted post at the end of each bin
+        np = _numpy()
+        return self.post_ids[np.argmax(self.cumulative, axis=0)] if len(self.post_ids) else self.post_ids
+
+
+def histogram(times, bin="minute", start=None, end=None):
+    # (edges, counts): the votes at `times` in each bin, from `start` to `end` as for VoteTimelines
+    timelines = VoteTimelines.from_times({0: times}, bin, start, end)
+    return timelines.edges, timelines.counts[0]
+
+
+def cumulative(times, bin="minute", start=None, end=None):
+    # (edges, votes by the end of each bin), votes before `start` included
+    timelines = VoteTimelines.from_times({0: times}, bin, start, end)
+    return timelines.edges, timelines.cumulative[0]
+
+
+def velocity(times, bin="minute", window=60, per="hour", start=None, end=None):
+    # (edges, votes per `per` over the `window` bins up to each bin)
+    timelines = VoteTimelines.from_times({0: times}, bin, start, end)
+    return timelines.edges, timelines.velocity(window, per)[0]
+
+
+def post_votes(client, post_id, context="client"):
+    # the raw votes of a post, fetched with as many of them a call as allowed
+    return list(client.iter_post_votes(post_id, per_page=MAX_PER_PAGE, context=context, raw=True))
+
+
+def post_vote_times(client, post_id, context="client"):
+    return vote_times(post_votes(client, post_id, context))
+
+
+def day_timelines(client, day, bin="hour", start=None, end=None, context="client", max_workers=None):
+    # VoteTimelines of the posts of a day, in the order the API lists them, their votes fetched `max_workers` posts at
+    # a time. The bins span the votes of all of them unless given a start and an end.
+    posts = client.get_specific_days_posts(day, context, raw=True)
+    with ThreadPoolExecutor(max_workers=max_workers or client.max_workers) as executor:
+        futures = [(post["id"], executor.submit(post_votes, client, post["id"], context)) for post in posts]
+        votes_by_post = dict((post_id, future.result()) for post_id, future in futures)
+    return VoteTimelines.from_votes(votes_by_post, bin, start, end)
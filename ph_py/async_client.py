@@ -0,0 +1,761 @@
+import asyncio
+import json
+import logging
+import math
+from collections import OrderedDict
+from time import perf_counter
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .cache import request_key
+from .cache import stale_routes
+from .error import ProductHuntError
+from .models.comment_forest import CommentForest
+from .helpers import parse_comments
+from .helpers import parse_details
+from .helpers import parse_followings_or_followers
+from .helpers import parse_notifications
+from .helpers import parse_posts
+from .helpers import parse_related_links
+from .helpers import parse_user
+from .helpers import parse_users
+from .helpers import parse_votes
+from .product_hunt_client import ProductHuntClient
+from .pagination import Cursor
+from .pagination import MAX_PER_PAGE
+from .rate_limit import RateLimiter
+from .retry import DEFAULT_TIMEOUT
+from .retry import RetryPolicy
+
+
+class _LeaderCancelled(Exception):
+    # what the waiters of a call get when the task making it is cancelled: they weren't, so they make it again
+    pass
+
+
+class AsyncSingleFlight(object):
+    """ SingleFlight for the tasks of an event loop """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+
+    async def do(self, key, function, *args):
+        future = self._calls.get(key)
+        while future is not None:
+            self.coalesced += 1
+            try:
+                # shielded, so that a waiter being cancelled doesn't cancel the call the others wait for
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # the first waiter back makes the call, the others wait for it
+                self.coalesced -= 1
+                future = self._calls.get(key)
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await function(*args)
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # nobody may be waiting, don't let asyncio complain about an exception never retrieved
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+
+class AsyncProductHuntClient:
+    API_BASE = ProductHuntClient.API_BASE
+    ERROR_CODES = ProductHuntClient.ERROR_CODES
+    logger = logging.getLogger('ph_client')
+    USER_COLLECTIONS = ProductHuntClient.USER_COLLECTIONS
+    _user_details = staticmethod(ProductHuntClient._user_details)
+    add_observer = ProductHuntClient.add_observer
+    notify = ProductHuntClient.notify
+    parse = ProductHuntClient.parse
+
+    def __init__(self, client_id, client_secret, redirect_uri, dev_token=None, pool_maxsize=100,
+                 pool_maxsize_per_host=0, keep_alive=True, rate_limiter=None, max_workers=8, cache=None,
+                 store=None, json_loads=None, single_flight=True, retry_policy=None, circuit_breaker=None,
+                 timeout=DEFAULT_TIMEOUT, observers=None):
+        if aiohttp is None:
+            raise ProductHuntError("AsyncProductHuntClient requires aiohttp, install it with "
+                                   "`pip install ph_py[async]`")
+
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.redirect_uri = redirect_uri
+        self.pool_maxsize = pool_maxsize
+        self.pool_maxsize_per_host = pool_maxsize_per_host
+        self.keep_alive = keep_alive
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.max_workers = max_workers
+        self.cache = cache
+        self.store = store
+        self.json_loads = json_loads if json_loads is not None else json.loads
+        self.single_flight = AsyncSingleFlight() if single_flight else None
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        # total seconds allowed to every request, or (connect, read) seconds
+        self.timeout = timeout
+        self.observers = list(observers) if observers else []
+        # the session has to be created inside a running event loop, see get_session()
+        self.session = None
+
+        if dev_token:
+            self.user_auth = {"access_token": dev_token}
+        else:
+            self.user_auth = None
+
+        # obtained on the first request made in client context, under a lock created inside the event loop
+        self.client_auth = None
+        self._auth_lock = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def get_session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize, limit_per_host=self.pool_maxsize_per_host,
+                                             force_close=not self.keep_alive)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def build_header(self, context):
+        if context == "client":
+            if self.client_auth is None:
+                await self.refresh_client_token()
+
+            return {"Authorization": "Bearer %s" % self.client_auth["access_token"]}
+        elif context == "user":
+            if self.user_auth is None:
+                raise ProductHuntError("No user authenticated!")
+
+            return {"Authorization": "Bearer %s" % self.user_auth["access_token"]}
+
+    async def send(self, method, url, headers, data):
+        # see ProductHuntClient.send
+        host = urlsplit(url).netloc
+        route = url[len(self.API_BASE):] if url.startswith(self.API_BASE) else url
+        if method == "DELETE":
+            kwargs = {"params": data}
+        else:
+            kwargs = {"data": data}
+        if isinstance(self.timeout, tuple):
+            kwargs["timeout"] = aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1])
+        elif self.timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=self.timeout)
+
+        attempt = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before(host)
+            try:
+                await self.wait_if_no_rate_limit_remaining()
+                status_code = response_headers = content = error = None
+                started = perf_counter()
+                try:
+                    async with self.get_session().request(method, url, headers=headers, **kwargs) as response:
+                        content = await response.read()
+                        status_code, response_headers = response.status, response.headers
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = e
+            except BaseException:
+                # cancellation included: the host never answered, so nothing is counted against it, but a trial
+                # request has to end for the circuit to close again
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.release(host)
+                raise
+
+            if response_headers is not None:
+                self.rate_limiter.update(response_headers)
+            if self.observers:
+                self.notify("on_request", method, route, status_code, perf_counter() - started,
+                            len(content) if content is not None else 0, error)
+                status = self.rate_limiter.status()
+                if status is not None:
+                    self.notify("on_rate_limit", *status)
+            if self.circuit_breaker is not None:
+                if error is not None or status_code >= 500:
+                    self.circuit_breaker.failure(host)
+                else:
+                    self.circuit_breaker.success(host)
+
+            delay = None
+            if self.retry_policy.should_retry(method, attempt, status_code, error):
+                delay = self.retry_policy.delay(attempt, status_code, response_headers)
+            if delay is None:
+                if error is not None:
+                    raise ProductHuntError("Error connecting to the Product Hunt API: %s" % (str(error) or repr(error)))
+                return status_code, response_headers, content
+
+            attempt += 1
+            self.logger.warning("%s %s failed (%s), retry %d in %.1fs" % (method, url, error or status_code, attempt,
+                                                                          delay))
+            if self.observers:
+                self.notify("on_retry", method, route, attempt, delay, error or status_code)
+            await asyncio.sleep(delay)
+
+    async def make_request(self, method, route, data, context="", retry=False):
+        headers = {}
+        if context:
+            headers = await self.build_header(context)
+
+        key = None
+        if method == "GET":
+            key = request_key(method, route, data, context, headers)
+            if self.cache is not None:
+                cached = self.cache.get(key)
+                if self.observers:
+                    self.notify("on_cache", route, cached is not None)
+                if cached is not None:
+                    return cached
+            if self.single_flight is not None and not retry:
+                return await self.single_flight.do(key, self._make_request, method, route, data, context, retry,
+                                                   headers, key)
+        return await self._make_request(method, route, data, context, retry, headers, key)
+
+    async def _make_request(self, method, route, data, context, retry, headers, key):
+        status_code, _, content = await self.send(method, self.API_BASE + route, headers, data)
+        if status_code == 429 or status_code >= 500:
+            raise ProductHuntError("The Product Hunt API answered %d to %s %s" % (status_code, method, route),
+                                   status_code)
+
+        started = perf_counter()
+        try:
+            json_data = self.json_loads(content)
+        except ValueError as je:
+            self.logger.error(str(je))
+            raise ProductHuntError("Error in parsing JSON from the Product Hunt API when making a request")
+        if self.observers:
+            self.notify("on_decode", method, route, perf_counter() - started, len(content))
+
+        if status_code in self.ERROR_CODES:
+            if status_code == 401 and context == "client" and not retry:
+                await self.refresh_client_token(headers.get("Authorization"))
+                return await self.make_request(method, route, data, context, True)
+            else:
+                raise ProductHuntError(json_data["error_description"], status_code)
+
+        if self.cache is not None:
+            if key is not None:
+                self.cache.set(key, json_data, len(content))
+            elif context:
+                for pattern in stale_routes(route):
+                    self.cache.invalidate(pattern)
+        return json_data
+
+    async def run_in_executor(self, function, *args):
+        # the store does blocking I/O, keep it off the event loop
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    async def get_stored(self, kind, key, route, context, refresh=False):
+        # see ProductHuntClient.get_stored
+        if self.store is not None and not refresh:
+            response = await self.run_in_executor(self.store.get, kind, key)
+            if response is not None:
+                return response
+
+        response = await self.make_request("GET", route, None, context)
+        if self.store is not None:
+            await self.run_in_executor(self.store.save, kind, key, response)
+        return response
+
+    def build_authorize_url(self):
+        url = self.API_BASE + "oauth/authorize?client_id=%s&redirect_uri=%s&response_type=code&scope=public private" % \
+              (self.client_id, self.redirect_uri)
+
+        return url
+
+    # OAuth helpers
+    async def oauth_user_token(self, code):
+        data = {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "redirect_uri": self.redirect_uri,
+            "grant_type": "authorization_code",
+            "code": code
+        }
+
+        self.user_auth = await self.make_request("POST", "oauth/token", data, "")
+        return self.user_auth
+
+    async def oauth_client_token(self):
+        data = {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "grant_type": "client_credentials"
+        }
+
+        self.client_auth = await self.make_request("POST", "oauth/token", data, "")
+        return self.client_auth
+
+    async def refresh_client_token(self, expired_header=None):
+        # see ProductHuntClient.refresh_client_token
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            if self.client_auth is None or expired_header == "Bearer %s" % self.client_auth["access_token"]:
+                await self.oauth_client_token()
+            return self.client_auth
+
+    # Post-related functions
+    async def get_todays_posts(self, context="client", raw=False):
+        responses = await self.make_request("GET", "posts", None, context)
+        responses = responses["posts"]
+
+        return self.parse(parse_posts, responses, raw)
+
+    async def get_previous_days_posts(self, days_ago, context="client", raw=False):
+        responses = await self.make_request("GET", "posts", {"days_ago": days_ago}, context)
+        responses = responses["posts"]
+
+        return self.parse(parse_posts, responses, raw)
+
+    async def get_specific_days_posts(self, day, context="client", raw=False):
+        responses = await self.make_request("GET", "posts", {"day": day}, context)
+        responses = responses["posts"]
+
+        return self.parse(parse_posts, responses, raw)
+
+    async def get_details_of_post(self, post_id, context="client", raw=False):
+        post = await self.get_stored("post", post_id, "posts/%d" % post_id, context)
+        return self.parse(parse_posts, post["post"], raw)
+
+    async def create_a_post(self, url, name, tagline):
+        data = {
+            "post": {
+                "url": url,
+                "name": name,
+                "tagline": tagline
+            }
+        }
+        post = await self.make_request("POST", "posts", data, "user")
+        return parse_posts(post["post"])
+
+    async def find_post_by_slug(self, slug, context="user"):
+        if self.store is not None:
+            post_id = await self.run_in_executor(self.store.get, "slug", slug)
+            if post_id is not None:
+                return post_id
+
+        post_id = None
+        url = self.API_BASE + "posts/all"
+        data = {
+            "search[slug]": slug
+        }
+        headers = await self.build_header(context)
+        status_code, _, content = await self.send("GET", url, headers, data)
+        try:
+            json_data = self.json_loads(content)
+        except ValueError as je:
+            self.logger.error(str(je))
+            raise ProductHuntError("Error in parsing JSON from the Product Hunt API")
+        if status_code in self.ERROR_CODES:
+            raise ProductHuntError(json_data["error_description"], status_code)
+        else:
+            if json_data and json_data['posts']:
+                post_id = json_data['posts'][0]['id']
+        if self.store is not None and post_id is not None:
+            await self.run_in_executor(self.store.save, "slug", slug, post_id)
+        return post_id
+
+    # Notification-related functions
+    async def show_notifications(self, older=None, newer=None, per_page=100, order=None, raw=False):
+        data = {
+            "per_page": per_page
+        }
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        notifications = await self.make_request("GET", "notifications", data, "user")
+        return self.parse(parse_notifications, notifications["notifications"], raw)
+
+    async def iter_notifications(self, older=None, newer=None, per_page=100, order=None, max_items=None, stop=None,
+                                 since=None, raw=False):
+        data = {"per_page": per_page}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        async for notifications in self.paginate("notifications", "notifications", data, "user", max_items, stop,
+                                                 since):
+            for notification in self.parse(parse_notifications, notifications, raw):
+                yield notification
+
+    async def clear_notifications(self):
+        notifications = await self.make_request("DELETE", "notifications", None, "user")
+        return parse_notifications(notifications["notifications"])
+
+    # User-related functions
+    async def get_users(self, older=None, newer=None, per_page=100, order=None, context="client", raw=False):
+        data = {"per_page": per_page}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        users = await self.make_request("GET", "users", data, context)
+        return self.parse(parse_users, users["users"], raw)
+
+    async def iter_users(self, older=None, newer=None, per_page=100, order=None, context="client", max_items=None,
+                         stop=None, since=None, raw=False):
+        data = {"per_page": per_page}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        async for users in self.paginate("users", "users", data, context, max_items, stop, since):
+            for user in self.parse(parse_users, users, raw):
+                yield user
+
+    async def get_user(self, username, context="client", raw=False):
+        user = await self.get_stored("user", username, "users/%s" % username, context)
+        return self.parse(parse_users, user["user"], raw)
+
+    async def get_details_of_user(self, username, context="client", raw=False):
+        user, u = await self._load_user(username, context)
+        await self._get_user_collections(u, context, raw)
+        return self._user_details(user, u, raw)
+
+    async def get_details_of_users(self, usernames, context="client", raw=False, max_workers=None):
+        # see ProductHuntClient.get_details_of_users, at most `max_workers` users or lists are fetched at once
+        usernames = list(OrderedDict.fromkeys(usernames))
+        semaphore = asyncio.Semaphore(max_workers or self.max_workers)
+        errors = {}
+
+        async def limited(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        async def get_details(username):
+            try:
+                user, u = await limited(self._load_user(username, context))
+                await self._get_user_collections(u, context, raw, per_page=MAX_PER_PAGE, max_workers=1, wrap=limited)
+                return self._user_details(user, u, raw)
+            except Exception as e:
+                self.logger.warning("Failed getting the details of user %s: %s" % (username, e))
+                errors[username] = e
+
+        results = await asyncio.gather(*[get_details(username) for username in usernames])
+        users = OrderedDict((username, result) for username, result in zip(usernames, results)
+                            if username not in errors)
+        return users, errors
+
+    async def _load_user(self, username, context):
+        user = await self.get_stored("user", username, "users/%s" % username, context)
+        try:
+            return user["user"], parse_user(user["user"])
+        except KeyError:
+            self.logger.warning("Trying to recover from KeyError while getting `user` %s" % username)
+            user = await self.get_stored("user", username, "users/%s" % username, context, refresh=True)
+            return user["user"], parse_user(user["user"])
+
+    async def _get_user_collections(self, u, context, raw, per_page=50, max_workers=None, wrap=None):
+        # votes, followers and followings are incomplete above 50, retrieve them as paginated and concurrently
+        fields = []
+        pages = []
+        for field, count_field, getter in self.USER_COLLECTIONS:
+            count = getattr(u, count_field)
+            if count > 50:
+                fields.append(field)
+                coroutine = getattr(self, getter)(u.id, per_page=per_page, context=context, count=count,
+                                                  max_workers=max_workers, raw=raw)
+                pages.append(wrap(coroutine) if wrap is not None else coroutine)
+
+        results = await asyncio.gather(*pages, return_exceptions=True)
+        for field, result in zip(fields, results):
+            if isinstance(result, KeyError):
+                self.logger.warning(str(result))
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                setattr(u, field, result)
+
+    # Vote-related functions
+    async def create_vote(self, post_id):
+        vote = await self.make_request("POST", "posts/%d/vote" % post_id, None, "user")
+        return parse_votes(vote)
+
+    async def delete_vote(self, post_id):
+        vote = await self.make_request("DELETE", "posts/%d/vote" % post_id, None, "user")
+
+        return parse_votes(vote)
+
+    async def get_user_votes(self, user_id, older=None, newer=None, per_page=50, order=None, context="client",
+                             count=None, max_workers=None, raw=False):
+        votes = self.iter_user_votes(user_id, older, newer, per_page, order, context, count, max_workers, raw)
+        return [vote async for vote in votes]
+
+    async def iter_user_votes(self, user_id, older=None, newer=None, per_page=50, order=None, context="client",
+                              count=None, max_workers=None, raw=False):
+        data = {"per_page": per_page, "page": 1}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        async for votes in self._get_pages("users/%d/votes" % user_id, "votes", data, context, count, max_workers):
+            for vote in self.parse(parse_votes, votes, raw):
+                yield vote
+
+    async def get_user_followers(self, user_id, older=None, newer=None, per_page=50, order=None, context="client",
+                                 count=None, max_workers=None, raw=False):
+        users = self.iter_user_followers(user_id, older, newer, per_page, order, context, count, max_workers, raw)
+        return [user async for user in users]
+
+    async def iter_user_followers(self, user_id, older=None, newer=None, per_page=50, order=None, context="client",
+                                  count=None, max_workers=None, raw=False):
+        data = {"per_page": per_page, "page": 1}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        async for users in self._get_pages("users/%d/followers" % user_id, "followers", data, context, count,
+                                           max_workers):
+            for user in self.parse(parse_followings_or_followers, users, raw):
+                yield user
+
+    async def get_user_followings(self, user_id, older=None, newer=None, per_page=50, order=None, context="client",
+                                  count=None, max_workers=None, raw=False):
+        users = self.iter_user_followings(user_id, older, newer, per_page, order, context, count, max_workers, raw)
+        return [user async for user in users]
+
+    async def iter_user_followings(self, user_id, older=None, newer=None, per_page=50, order=None, context="client",
+                                   count=None, max_workers=None, raw=False):
+        data = {"per_page": per_page, "page": 1}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        async for users in self._get_pages("users/%d/following" % user_id, "following", data, context, count,
+                                           max_workers):
+            for user in self.parse(parse_followings_or_followers, users, raw):
+                yield user
+
+    async def _get_pages(self, route, key, data, context, count=None, max_workers=None):
+        # see ProductHuntClient._get_pages, at most `max_workers` pages are in flight at once
+        if max_workers is None:
+            max_workers = self.max_workers
+        pages = int(math.ceil(count / float(data["per_page"]))) if count else 0
+
+        if pages > 1 and max_workers > 1:
+            semaphore = asyncio.Semaphore(max_workers)
+
+            async def get_page(page):
+                async with semaphore:
+                    response = await self.make_request("GET", route, dict(data, page=page), context)
+                return response[key]
+
+            results = await asyncio.gather(*[get_page(page) for page in range(data["page"], data["page"] + pages)])
+            for items in results:
+                if not items:
+                    return
+                yield items
+            data["page"] = data["page"] + pages
+
+        items = (await self.make_request("GET", route, data, context))[key]
+        while items:
+            yield items
+            data["page"] = data["page"] + 1
+            items = (await self.make_request("GET", route, data, context))[key]
+
+    async def paginate(self, route, key, data=None, context="client", max_items=None, stop=None, since=None):
+        # see ProductHuntClient.paginate
+        cursor = Cursor(data, max_items, stop, since)
+        while not cursor.done:
+            params = cursor.params()
+            items = (await self.make_request("GET", route, params, context))[key]
+            items = cursor.advance(items, params.get("per_page"))
+            if items:
+                yield items
+
+    async def get_post_votes(self, post_id, older=None, newer=None, per_page=100, order=None, context="client",
+                             raw=False):
+        data = {"per_page": per_page}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        votes = await self.make_request("GET", "posts/%d/votes" % post_id, data, context)
+        return self.parse(parse_votes, votes["votes"], raw)
+
+    async def iter_post_votes(self, post_id, older=None, newer=None, per_page=100, order=None, context="client",
+                              max_items=None, stop=None, since=None, raw=False):
+        data = {"per_page": per_page}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        async for votes in self.paginate("posts/%d/votes" % post_id, "votes", data, context, max_items, stop, since):
+            for vote in self.parse(parse_votes, votes, raw):
+                yield vote
+
+    # Comment-related functions
+    async def get_comments(self, post_id, older=None, newer=None, per_page=100, order=None, context="client",
+                           raw=False):
+        data = {"per_page": per_page}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        comments = await self.make_request("GET", "posts/%d/comments" % post_id, data, context)
+        return self.parse(parse_comments, comments["comments"], raw)
+
+    async def iter_comments(self, post_id, older=None, newer=None, per_page=100, order=None, context="client",
+                            max_items=None, stop=None, since=None, raw=False):
+        data = {"per_page": per_page}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        async for comments in self.paginate("posts/%d/comments" % post_id, "comments", data, context, max_items, stop,
+                                            since):
+            for comment in self.parse(parse_comments, comments, raw):
+                yield comment
+
+    async def get_full_comment_thread(self, post_id, per_page=100, context="client"):
+        # every comment of the post with all of its replies, indexed as they come in page by page
+        forest = CommentForest()
+        async for comments in self.paginate("posts/%d/comments" % post_id, "comments", {"per_page": per_page}, context):
+            forest.add(parse_comments(comments))
+        return forest
+
+    async def create_comment(self, body, post_id, parent_comment_id=None):
+        data = {
+            "comment": {
+                "body": body
+            }
+        }
+
+        if parent_comment_id:
+            data["comment"]["parent_comment_id"] = parent_comment_id
+
+        comment = await self.make_request("POST", "posts/%d/comments" % post_id, data, "user")
+        return parse_comments(comment["comment"])
+
+    async def update_comment(self, body, comment_id):
+        data = {
+            "comment": {
+                "body": body
+            }
+        }
+
+        comment = await self.make_request("PUT", "comments/%d" % comment_id, data, "user")
+        return parse_comments(comment["comment"])
+
+    # User Detail related functions
+    async def get_current_user_details(self, raw=False):
+        details = await self.make_request("GET", "me", None, "user")
+        return self.parse(parse_details, details["user"], raw)
+
+    # Related-links functions
+    async def create_related_link(self, post_id, url, title=None):
+        data = {"url": url}
+
+        if title:
+            data["title"] = title
+
+        related_link = await self.make_request("POST", "posts/%d/related_links" % post_id, data, "user")
+        return parse_related_links(related_link)
+
+    async def update_related_link(self, post_id, related_link_id, title):
+        data = {"title": title}
+
+        related_link = await self.make_request("PUT", "posts/%d/related_links/%d" % (post_id, related_link_id), data,
+                                               "user")
+        return parse_related_links(related_link)
+
+    async def delete_related_link(self, post_id, related_link_id):
+        related_link = await self.make_request("DELETE", "posts/%d/related_links/%d" % (post_id, related_link_id),
+                                               None, "user")
+        return parse_related_links(related_link)
+
+    async def get_rate_limit_remaining(self):
+        status = self.rate_limiter.status()
+        if status is not None:
+            return status
+
+        headers = await self.build_header("user")
+        status_code, response_headers, content = await self.send("GET", self.API_BASE + "me", headers, None)
+        try:
+            json_data = self.json_loads(content)
+        except ValueError as je:
+            self.logger.warning(str(je))
+            self.logger.warning("An error occurred parsing JSON when checking API limit")
+            return None
+        if status_code in self.ERROR_CODES:
+            raise ProductHuntError(json_data["error_description"], status_code)
+        return int(response_headers['X-Rate-Limit-Remaining']), int(response_headers['X-Rate-Limit-Reset'])
+
+    async def wait_if_no_rate_limit_remaining(self):
+        """ 900 API calls allowed every 15 minutes """
+        delay = self.rate_limiter.reserve()
+        if delay > 0:
+            self.logger.info(
+                'API rate limit approaching, going to wait for about %s min until reset' % round(delay / 60, 1))
+            if self.observers:
+                self.notify("on_rate_limit_wait", delay)
+            await asyncio.sleep(delay)
+            self.logger.info("Resuming, API calls now remaining %s" % self.rate_limiter.remaining)
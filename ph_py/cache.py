@@ -0,0 +1,124 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+
+def request_key(method, route, data, context, headers):
+    params = tuple(sorted((str(k), repr(v)) for k, v in data.items())) if data else ()
+    # responses in user context depend on who is asking, so the user's token is part of the key
+    auth = headers.get("Authorization") if context == "user" else None
+    return method, route, params, context, auth
+
+
+# Routes are matched on whole segments by patterns such as "posts/*/comments": "*" stands for any one segment, and a
+# pattern matches the route it names and every route below it, or that route only when it ends with "$".
+
+# write route -> the reads it makes stale, {1} standing for the second segment of the write route
+STALE_READS = (
+    ("posts$", ("posts$",)),
+    ("notifications$", ("notifications", "me$")),
+    # votes_count of the post in its details and in the lists, and the votes of the user
+    ("posts/*/vote$", ("posts/{1}", "posts$", "users/*/votes", "me$")),
+    ("posts/*/comments$", ("posts/{1}", "posts$")),
+    # the post of a comment isn't in the route, every post's comments may hold it
+    ("comments/*$", ("comments/{1}", "posts/*/comments", "posts/*$")),
+    ("posts/*/related_links", ("posts/{1}",)),
+)
+
+
+def route_matches(pattern, route):
+    exact = pattern.endswith("$")
+    pattern = pattern.rstrip("$").split("/")
+    route = route.split("/")
+    if len(route) < len(pattern) or (exact and len(route) != len(pattern)):
+        return False
+    return all(part == "*" or part == segment for part, segment in zip(pattern, route))
+
+
+def resource_prefix(route):
+    # "posts/12/comments" -> "posts/12": a write on a resource makes every cached read below it stale
+    return "/".join(route.split("/")[:2])
+
+
+def stale_routes(route):
+    # the patterns of the cached reads a write on `route` makes stale
+    segments = route.split("/")
+    for write, reads in STALE_READS:
+        if route_matches(write, route):
+            return [read.replace("{1}", segments[1]) if len(segments) > 1 else read for read in reads]
+    return [resource_prefix(route)]
+
+
+class ResponseCache(object):
+    """ In-memory LRU cache of decoded API responses, with per-route TTLs """
+
+    def __init__(self, ttl=60, route_ttls=None, max_entries=1024, max_bytes=None):
+        self.ttl = ttl
+        # route prefix -> TTL in seconds, the longest matching prefix wins and a TTL of 0 disables caching
+        self.route_ttls = sorted((route_ttls or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, route):
+        for prefix, ttl in self.route_ttls:
+            if route.startswith(prefix):
+                return ttl
+        return self.ttl
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, size, expires_at = entry
+                if expires_at > monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def set(self, key, value, size=0):
+        ttl = self.ttl_for(key[1])
+        if not ttl or (self.max_bytes is not None and size > self.max_bytes):
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, monotonic() + ttl)
+            self.size += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.size > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+
+    def invalidate(self, route_prefix=None):
+        # drops the entries of the routes matched by a pattern (see route_matches), e.g. "posts/12" drops posts/12
+        # and posts/12/comments but not posts/123; or every entry
+        with self._lock:
+            if route_prefix is None:
+                self._entries.clear()
+                self.size = 0
+                return
+            for key in [key for key in self._entries if route_matches(route_prefix, key[1])]:
+                self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.size
+            }
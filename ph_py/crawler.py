@@ -0,0 +1,144 @@
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from datetime import timedelta
+
+from .error import ProductHuntError
+
+logger = logging.getLogger('ph_client')
+
+
+def day_range(start_day, end_day):
+    day = date.fromisoformat(str(start_day))
+    end_day = date.fromisoformat(str(end_day))
+    while day <= end_day:
+        yield day.isoformat()
+        day += timedelta(days=1)
+
+
+class Checkpoint(object):
+    """ Days already crawled, saved to a JSON file after each one so that an interrupted crawl can resume """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.done = set(json.load(f)["done"])
+
+    def __contains__(self, day):
+        return day in self.done
+
+    def add(self, day):
+        self.done.add(day)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"done": sorted(self.done)}, f)
+        os.replace(tmp_path, self.path)
+
+
+def hydrate_post(client, post, votes=False, comments=False):
+    # raw details of a post, optionally with all of its votes and comments. The details are copied before adding them,
+    # with a cache or coalesced requests they are the payload other callers get too.
+    try:
+        post = dict(client.get_stored("post", post["id"], "posts/%d" % post["id"], "client")["post"])
+    except ProductHuntError as e:
+        if e.status_code != 404:
+            raise
+        logger.warning("Post %s not found, keeping it without details" % post["id"])
+        return post
+
+    if votes:
+        post["votes"] = [vote for page in client.paginate("posts/%d/votes" % post["id"], "votes", {"per_page": 100})
+                         for vote in page]
+    if comments:
+        post["comments"] = [comment for page in
+                            client.paginate("posts/%d/comments" % post["id"], "comments", {"per_page": 100})
+                            for comment in page]
+    return post
+
+
+def crawl_day(client, day, votes=False, comments=False, max_workers=4):
+    posts = client.make_request("GET", "posts", {"day": day}, "client")["posts"]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda post: hydrate_post(client, post, votes, comments), posts))
+
+
+def crawl_days(client, start_day, end_day, output_dir, checkpoint=None, votes=False, comments=False, max_workers=4):
+    # writes the hydrated posts of each day from start_day to end_day (inclusive) to <output_dir>/<day>.jsonl,
+    # skipping the days the checkpoint records as done. Returns the days crawled by this run.
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    if checkpoint is None:
+        checkpoint = os.path.join(output_dir, "checkpoint.json")
+    checkpoint = Checkpoint(checkpoint)
+
+    crawled = []
+    for day in day_range(start_day, end_day):
+        if day in checkpoint:
+            logger.debug("Skipping %s, already crawled" % day)
+            continue
+
+        posts = crawl_day(client, day, votes, comments, max_workers)
+        path = os.path.join(output_dir, "%s.jsonl" % day)
+        with open(path + ".tmp", "w") as f:
+            for post in posts:
+                f.write(json.dumps(post))
+                f.write("\n")
+        os.replace(path + ".tmp", path)
+
+        checkpoint.add(day)
+        crawled.append(day)
+        logger.info("Crawled %s posts of %s" % (len(posts), day))
+    return crawled
+
+
+def main(argv=None):
+    from .product_hunt_client import ProductHuntClient
+    from .store import SQLiteStore
+    from .transport import RecordingTransport
+    from .transport import ReplayTransport
+    from .transport import RequestsTransport
+
+    parser = argparse.ArgumentParser(description="Crawl the posts launched on Product Hunt over a range of days. "
+                                                 "Credentials are read from the PH_CLIENT_ID, PH_CLIENT_SECRET and "
+                                                 "PH_REDIRECT_URI environment variables.")
+    parser.add_argument("start_day", help="first day to crawl, as YYYY-MM-DD")
+    parser.add_argument("end_day", help="last day to crawl (inclusive), as YYYY-MM-DD")
+    parser.add_argument("-o", "--output", default="ph_crawl", help="output directory (default: %(default)s)")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <output>/checkpoint.json)")
+    parser.add_argument("--votes", action="store_true", help="also fetch the votes of every post")
+    parser.add_argument("--comments", action="store_true", help="also fetch the comments of every post")
+    parser.add_argument("--workers", type=int, default=4, help="posts hydrated at once (default: %(default)s)")
+    parser.add_argument("--store", help="SQLite file where fetched posts are kept across runs")
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument("--record", help="cassette file where every API response is recorded")
+    recording.add_argument("--replay", help="cassette file recorded by --record, to crawl again with no network")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    store = SQLiteStore(args.store) if args.store else None
+    pool_maxsize = max(10, args.workers)
+    transport = None
+    if args.record:
+        transport = RecordingTransport(args.record, RequestsTransport(
+            ProductHuntClient.build_session(pool_maxsize, pool_maxsize, True)))
+    elif args.replay:
+        transport = ReplayTransport(args.replay)
+    if args.replay:
+        # a replay needs no credentials
+        client_id = client_secret = ""
+    else:
+        client_id, client_secret = os.environ["PH_CLIENT_ID"], os.environ["PH_CLIENT_SECRET"]
+    with ProductHuntClient(client_id, client_secret,
+                           os.environ.get("PH_REDIRECT_URI", "http://localhost:5000"), store=store,
+                           pool_maxsize=pool_maxsize, transport=transport) as client:
+        crawl_days(client, args.start_day, args.end_day, args.output, args.checkpoint, args.votes, args.comments,
+                   args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import warnings
+from datetime import timezone
+from itertools import islice
+from operator import attrgetter
+from operator import itemgetter
+
+from .pagination import parse_timestamp
+
+# numpy and pyarrow are optional (pip install ph_py[export]): the NumPy exporters need numpy, the Arrow and Parquet
+# ones need both. Timestamps are parsed by pyarrow when it is installed, by numpy otherwise.
+
+# columns of each kind of record: (name, type, path in the raw JSON, path in the model when it differs)
+COLUMNS = {
+    "votes": (
+        ("id", "int", "id"),
+        ("created_at", "timestamp", "created_at"),
+        ("post_id", "int", "post_id"),
+        ("user_id", "int", "user_id")
+    ),
+    "followers": (
+        ("user_id", "int", "user.id", "id"),
+        ("created_at", "timestamp", "created_at"),
+        ("name", "str", "user.name", "name"),
+        ("username", "str", "user.username", "username")
+    ),
+    "posts": (
+        ("id", "int", "id"),
+        ("name", "str", "name"),
+        ("tagline", "str", "tagline"),
+        ("created_at", "timestamp", "created_at"),
+        ("day", "date", "day"),
+        ("votes_count", "int", "votes_count"),
+        ("comments_count", "int", "comments_count"),
+        ("user_id", "int", "user.id", "_user.id"),  # the raw slot, so that exporting doesn't parse the user
+        ("discussion_url", "str", "discussion_url"),
+        ("redirect_url", "str", "redirect_url")
+    )
+}
+
+DEFAULT_CHUNK_SIZE = 100000
+
+# numpy has no null integers, missing ones are exported as -1
+NUMPY_TYPES = {"int": "i8", "str": "O", "bool": "?", "timestamp": "datetime64[ms]", "date": "datetime64[D]"}
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("NumPy export requires numpy, install it with: pip install ph_py[export]")
+    return numpy
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Arrow and Parquet export require pyarrow, install it with: pip install ph_py[export]")
+    return pyarrow
+
+
+def _columns(kind):
+    return COLUMNS[kind] if isinstance(kind, str) else kind
+
+
+def _getter(path):
+    names = path.split(".")
+
+    def get(item):
+        for name in names:
+            if item is None:
+                return None
+            item = item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+        return item
+    return get
+
+
+def iter_chunks(items, chunk_size=DEFAULT_CHUNK_SIZE):
+    # lists of at most chunk_size items, so that iterators of any length are exported in bounded memory
+    items = iter(items)
+    chunk = list(islice(items, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, chunk_size))
+
+
+def extract(chunk, kind):
+    # column name -> list of the values of the chunk; it holds either raw dicts or models, not a mix of them
+    raw = isinstance(chunk[0], dict) if chunk else True
+    values = {}
+    for column in _columns(kind):
+        path = column[2] if raw or len(column) < 4 else column[3]
+        try:
+            # a C getter per column is the fastest way through a list of dicts or objects
+            if "." in path:
+                raise KeyError(path)
+            values[column[0]] = list(map(itemgetter(path) if raw else attrgetter(path), chunk))
+        except (KeyError, AttributeError):
+            get = _getter(path)
+            values[column[0]] = [get(item) for item in chunk]
+    return values
+
+
+def _optional_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def _arrow_timestamps(pa, values):
+    # timestamp[ms, UTC] array parsed by Arrow, None if any string is not a valid timestamp with a UTC offset
+    try:
+        return pa.array(values, pa.string()).cast(pa.timestamp("ms", tz="UTC"))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+
+def parse_timestamps(values):
+    # ISO 8601 strings -> datetime64[ms] in UTC, NaT where missing. They are parsed by Arrow when it is installed, by
+    # NumPy otherwise or when Arrow rejects one of them (no UTC offset, more than 3 digits of fraction); the strings
+    # NumPy rejects go through the parser of single timestamps, which raises ValueError on the invalid ones.
+    np = _numpy()
+    pa = _optional_pyarrow()
+    if pa is not None and len(values):
+        timestamps = _arrow_timestamps(pa, values)
+        if timestamps is not None:
+            return timestamps.to_numpy(zero_copy_only=False)
+    if None in values:
+        values = ["NaT" if value is None else value for value in values]
+    try:
+        with warnings.catch_warnings():
+            # NumPy warns that it converts strings with a UTC offset to UTC, which is what is wanted
+            warnings.filterwarnings("ignore", "no explicit representation of timezones")
+            return np.array(values, dtype="datetime64[ms]")
+    except ValueError:
+        return np.array([np.datetime64("NaT") if value == "NaT" else _parse_timestamp(np, value) for value in values],
+                        dtype="datetime64[ms]")
+
+
+def _parse_timestamp(np, value):
+    timestamp = parse_timestamp(str(value)).astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(timestamp, "ms")
+
+
+def to_numpy(items, kind="votes"):
+    # structured array with one field per column of the kind
+    np = _numpy()
+    columns = _columns(kind)
+    items = items if isinstance(items, list) else list(items)
+    values = extract(items, columns)
+    array = np.empty(len(items), dtype=[(column[0], NUMPY_TYPES[column[1]]) for column in columns])
+    for column in columns:
+        name, column_type = column[0], column[1]
+        if column_type == "timestamp":
+            array[name] = parse_timestamps(values[name])
+        elif column_type == "date":
+            array[name] = np.array(["NaT" if value is None else value for value in values[name]], dtype="datetime64[D]")
+        elif column_type == "int":
+            column_values = values[name]
+            if None in column_values:
+                column_values = [-1 if value is None else value for value in column_values]
+            array[name] = column_values
+        else:
+            array[name] = values[name]
+    return array
+
+
+def iter_numpy(items, kind="votes", chunk_size=DEFAULT_CHUNK_SIZE):
+    for chunk in iter_chunks(items, chunk_size):
+        yield to_numpy(chunk, kind)
+
+
+def arrow_schema(kind="votes"):
+    pa = _pyarrow()
+    types = {"int": pa.int64(), "str": pa.string(), "bool": pa.bool_(), "timestamp": pa.timestamp("ms", tz="UTC"),
+             "date": pa.date32()}
+    return pa.schema([(column[0], types[column[1]]) for column in _columns(kind)])
+
+
+def to_record_batch(items, kind="votes", schema=None):
+    pa = _pyarrow()
+    columns = _columns(kind)
+    if schema is None:
+        schema = arrow_schema(columns)
+    values = extract(items, columns)
+    arrays = []
+    for column, field in zip(columns, schema):
+        if column[1] == "timestamp":
+            timestamps = _arrow_timestamps(pa, values[column[0]])
+            if timestamps is None or timestamps.type != field.type:
+                timestamps = pa.array(parse_timestamps(values[column[0]]), field.type, from_pandas=True)
+            arrays.append(timestamps)
+        elif column[1] == "date":
+            arrays.append(pa.array(values[column[0]], pa.string()).cast(field.type))
+        else:
+            arrays.append(pa.array(values[column[0]], field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def iter_record_batches(items, kind="votes", chunk_size=DEFAULT_CHUNK_SIZE):
+    schema = arrow_schema(kind)
+    for chunk in iter_chunks(items, chunk_size):
+        yield to_record_batch(chunk, kind, schema)
+
+
+def to_arrow(items, kind="votes", chunk_size=DEFAULT_CHUNK_SIZE):
+    pa = _pyarrow()
+    return pa.Table.from_batches(list(iter_record_batches(items, kind, chunk_size)), schema=arrow_schema(kind))
+
+
+def write_parquet(items, path, kind="votes", chunk_size=DEFAULT_CHUNK_SIZE, compression="snappy"):
+    # writes one row group per chunk, only one chunk is held in memory at a time. Returns the number of rows written.
+    _pyarrow()
+    import pyarrow.parquet as pq
+
+    rows = 0
+    with pq.ParquetWriter(path, arrow_schema(kind), compression=compression) as writer:
+        for batch in iter_record_batches(items, kind, chunk_size):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
@@ -0,0 +1,312 @@
+import bisect
+import json
+import logging
+import mmap
+import os
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from .error import ProductHuntError
+from .pagination import MAX_PER_PAGE
+
+logger = logging.getLogger('ph_client')
+
+# numpy is optional: with it the graph is built and queried with vectorized operations, without it the same arrays are
+# plain `array`s and memoryviews
+
+# files of a saved graph, all of them little-endian int64
+ARRAYS = ("user_ids", "out_indptr", "out_indices", "in_indptr", "in_indices")
+DIRECTIONS = ("out", "in")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class Graph(object):
+    """ Directed follow graph in CSR form. Node i is the user user_ids[i], kept sorted so that a user id is found by
+    binary search; the users it follows are out_indices[out_indptr[i]:out_indptr[i + 1]] and its followers the same
+    slice of the in_ arrays. Every query takes and returns user ids. """
+
+    def __init__(self, user_ids, out_indptr, out_indices, in_indptr, in_indices):
+        self.user_ids = user_ids
+        self.out_indptr = out_indptr
+        self.out_indices = out_indices
+        self.in_indptr = in_indptr
+        self.in_indices = in_indices
+        self.numpy = _numpy() if hasattr(user_ids, "dtype") else None
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def __contains__(self, user_id):
+        return self.find(user_id) is not None
+
+    @property
+    def num_edges(self):
+        return len(self.out_indices)
+
+    def find(self, user_id):
+        # the node of a user, None if the user isn't in the graph
+        if self.numpy is not None:
+            i = int(self.user_ids.searchsorted(user_id))
+        else:
+            i = bisect.bisect_left(self.user_ids, user_id)
+        return i if i < len(self.user_ids) and self.user_ids[i] == user_id else None
+
+    def node(self, user_id):
+        i = self.find(user_id)
+        if i is None:
+            raise KeyError(user_id)
+        return i
+
+    def adjacency(self, direction="out"):
+        # (indptr, indices): "out" follows the follow edges, "in" walks them backwards to the followers
+        if direction not in DIRECTIONS:
+            raise ValueError("direction must be one of %s, not %r" % (DIRECTIONS, direction))
+        return (self.out_indptr, self.out_indices) if direction == "out" else (self.in_indptr, self.in_indices)
+
+    def degree(self, user_id, direction="out"):
+        indptr, _ = self.adjacency(direction)
+        i = self.node(user_id)
+        return int(indptr[i + 1] - indptr[i])
+
+    def degrees(self, direction="out"):
+        # the degree of every node, in the order of user_ids
+        indptr, _ = self.adjacency(direction)
+        if self.numpy is not None:
+            return self.numpy.diff(indptr)
+        return array("q", (indptr[i + 1] - indptr[i] for i in range(len(self.user_ids))))
+
+    def neighbors(self, user_id, direction="out"):
+        # the users followed by `user_id`, or following it with direction="in", sorted by id
+        indptr, indices = self.adjacency(direction)
+        i = self.node(user_id)
+        nodes = indices[indptr[i]:indptr[i + 1]]
+        if self.numpy is not None:
+            return self.user_ids[nodes].tolist()
+        return [self.user_ids[j] for j in nodes]
+
+    def k_hop(self, user_id, k, direction="out"):
+        # the users within k hops of `user_id`, itself excluded, as {user id: hops}
+        indptr, indices = self.adjacency(direction)
+        start = self.node(user_id)
+        if self.numpy is not None:
+            return self._k_hop_numpy(start, k, indptr, indices)
+
+        hops = {start: 0}
+        frontier = [start]
+        for hop in range(1, k + 1):
+            reached = []
+            for i in frontier:
+                for j in indices[indptr[i]:indptr[i + 1]]:
+                    if j not in hops:
+                        hops[j] = hop
+                        reached.append(j)
+            if not reached:
+                break
+            frontier = reached
+        del hops[start]
+        return dict((self.user_ids[i], hop) for i, hop in hops.items())
+
+    def _k_hop_numpy(self, start, k, indptr, indices):
+        numpy = self.numpy
+        hops = numpy.full(len(self.user_ids), -1, dtype=numpy.int64)
+        hops[start] = 0
+        frontier = numpy.array([start], dtype=numpy.int64)
+        for hop in range(1, k + 1):
+            # the concatenated adjacency slices of the whole frontier, gathered without a Python loop
+            starts = numpy.asarray(indptr[frontier])
+            lengths = numpy.asarray(indptr[frontier + 1]) - starts
+            total = int(lengths.sum())
+            if not total:
+                break
+            positions = numpy.repeat(starts - numpy.cumsum(lengths) + lengths, lengths) + numpy.arange(total)
+            reached = numpy.unique(numpy.asarray(indices[positions]))
+            reached = reached[hops[reached] < 0]
+            if not len(reached):
+                break
+            hops[reached] = hop
+            frontier = reached
+        hops[start] = -1
+        nodes = numpy.flatnonzero(hops > 0)
+        return dict(zip(self.user_ids[nodes].tolist(), hops[nodes].tolist()))
+
+    def save(self, path):
+        # a directory of raw int64 arrays that load() maps back into memory without reading them
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        for name in ARRAYS:
+            values = getattr(self, name)
+            with open(os.path.join(path, name + ".i8"), "wb") as f:
+                if self.numpy is not None:
+                    f.write(self.numpy.ascontiguousarray(values, dtype="<i8").tobytes())
+                else:
+                    f.write(array("q", values).tobytes())
+        with open(os.path.join(path, "graph.json"), "w") as f:
+            json.dump({"format": 1, "nodes": len(self.user_ids), "edges": self.num_edges}, f)
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        # with use_mmap the arrays stay on disk and are paged in by the queries that touch them, so that a graph of
+        # millions of edges opens at once
+        numpy = _numpy()
+        arrays = []
+        for name in ARRAYS:
+            filename = os.path.join(path, name + ".i8")
+            if use_mmap and os.path.getsize(filename):
+                with open(filename, "rb") as f:
+                    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                with open(filename, "rb") as f:
+                    buffer = f.read()
+            if numpy is not None:
+                arrays.append(numpy.frombuffer(buffer, dtype="<i8"))
+            elif isinstance(buffer, bytes):
+                values = array("q")
+                values.frombytes(buffer)
+                arrays.append(values)
+            else:
+                arrays.append(memoryview(buffer).cast("q"))
+        return cls(*arrays)
+
+
+class GraphBuilder(object):
+    """ Collects follow edges as pairs of user ids in flat int64 arrays, 16 bytes an edge, and builds the Graph """
+
+    def __init__(self):
+        self.sources = array("q")
+        self.targets = array("q")
+        # users to keep as nodes even without any edge
+        self.users = array("q")
+
+    def add_user(self, user_id):
+        self.users.append(user_id)
+
+    def add_edge(self, follower_id, followed_id):
+        if follower_id != followed_id:
+            self.sources.append(follower_id)
+            self.targets.append(followed_id)
+
+    def add_edges(self, follower_ids, followed_ids):
+        for follower_id, followed_id in zip(follower_ids, followed_ids):
+            self.add_edge(follower_id, followed_id)
+
+    def build(self):
+        # edges seen twice, e.g. from both of their ends, are kept once
+        numpy = _numpy()
+        if numpy is not None:
+            return self._build_numpy(numpy)
+
+        user_ids = array("q", sorted(set(self.sources) | set(self.targets) | set(self.users)))
+        index = dict((user_id, i) for i, user_id in enumerate(user_ids))
+        edges = set((index[source], index[target]) for source, target in zip(self.sources, self.targets))
+        return Graph(user_ids, *(self._csr(edges, len(user_ids)) +
+                                 self._csr(((target, source) for source, target in edges), len(user_ids))))
+
+    @staticmethod
+    def _csr(edges, n):
+        edges = sorted(edges)
+        indptr = array("q", [0]) * (n + 1)
+        for source, _ in edges:
+            indptr[source + 1] += 1
+        for i in range(n):
+            indptr[i + 1] += indptr[i]
+        return indptr, array("q", (target for _, target in edges))
+
+    def _build_numpy(self, numpy):
+        sources = numpy.frombuffer(self.sources, dtype=numpy.int64)
+        targets = numpy.frombuffer(self.targets, dtype=numpy.int64)
+        users = numpy.frombuffer(self.users, dtype=numpy.int64)
+        user_ids = _unique(numpy, numpy.concatenate((sources, targets, users)))
+        sources = user_ids.searchsorted(sources)
+        targets = user_ids.searchsorted(targets)
+        n = len(user_ids)
+
+        def csr(rows, columns):
+            # sorting the edges as row * n + column puts them in CSR order, and unique drops the duplicates
+            keys = _unique(numpy, rows * n + columns)
+            indptr = numpy.zeros(n + 1, dtype=numpy.int64)
+            numpy.cumsum(numpy.bincount(keys // n, minlength=n), out=indptr[1:])
+            return indptr, keys % n
+
+        return Graph(user_ids, *(csr(sources, targets) + csr(targets, sources)))
+
+
+def _unique(numpy, values):
+    # numpy.unique, by sorting in place: several times faster than the hash table recent numpy versions use for it
+    values.sort()
+    if not len(values):
+        return values
+    keep = numpy.empty(len(values), dtype=bool)
+    keep[0] = True
+    numpy.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def _follows(client, user_id, context, followings, followers):
+    # the ids of the users `user_id` follows and of those following it, paged with as many records a call as allowed
+    followed = array("q")
+    following = array("q")
+    if followings:
+        followed.extend(item["user"]["id"] for item in client.iter_user_followings(
+            user_id, per_page=MAX_PER_PAGE, context=context, max_workers=1, raw=True))
+    if followers:
+        following.extend(item["user"]["id"] for item in client.iter_user_followers(
+            user_id, per_page=MAX_PER_PAGE, context=context, max_workers=1, raw=True))
+    return followed, following
+
+
+def crawl(client, seeds, max_users=1000, max_depth=2, followings=True, followers=True, context="client",
+          max_workers=None):
+    # Breadth-first crawl of the follow graph from the seed users (ids or usernames): the users up to `max_depth` hops
+    # away are crawled, `max_users` of them at most, each level `max_workers` users at a time. Returns the Graph, whose
+    # edges also reach the users found but not crawled, and a dict of user id -> ProductHuntError for those that failed.
+    builder = GraphBuilder()
+    errors = {}
+    frontier = []
+    for seed in seeds:
+        user_id = seed if isinstance(seed, int) else client.get_user(seed, context, raw=True)["id"]
+        if user_id not in frontier:
+            frontier.append(user_id)
+    frontier = frontier[:max_users]
+    visited = set(frontier)
+
+    with ThreadPoolExecutor(max_workers=max_workers or client.max_workers) as executor:
+        for depth in range(max_depth + 1):
+            futures = [(user_id, executor.submit(_follows, client, user_id, context, followings, followers))
+                       for user_id in frontier]
+            found = array("q")
+            for user_id, future in futures:
+                try:
+                    followed, following = future.result()
+                except ProductHuntError as e:
+                    logger.warning("Failed crawling the follows of user %d: %s" % (user_id, e))
+                    errors[user_id] = e
+                    continue
+                builder.add_user(user_id)
+                for other in followed:
+                    builder.add_edge(user_id, other)
+                for other in following:
+                    builder.add_edge(other, user_id)
+                found.extend(followed)
+                found.extend(following)
+
+            frontier = []
+            if depth < max_depth:
+                for user_id in found:
+                    if len(visited) >= max_users:
+                        break
+                    if user_id not in visited:
+                        visited.add(user_id)
+                        frontier.append(user_id)
+            if not frontier:
+                break
+            logger.info("Crawled %d users, %d edges, %d more at depth %d" % (len(visited) - len(frontier),
+                                                                            len(builder.sources), len(frontier),
+                                                                            depth + 1))
+    return builder.build(), errors
@@ -1,6 +1,7 @@
 from .models.badges import Badge
 from .models.comment import Comment
 from .models.external_link import ExternalLink
+from .models.follower import Follower
 from .models.install_link import InstallLink
 from .models.media import Media
 from .models.notification import Notification
@@ -43,7 +44,9 @@ def parse_details(details):
         details["role"],
         details["permissions"],
         details["notifications"],
-        details["first_time_user"]
+        details["first_time_user"],
+        details.get("twitter_username"),
+        details.get("website_url")
     )
 
 
@@ -169,37 +172,37 @@ def parse_user(user):
 def parse_followings_or_followers(users):
     if isinstance(users, list):
         return [
-            {
-                "id": user["user"]["id"],
-                "created_at": user["created_at"],
-                "name":  user["user"]["name"],
-                "username":  user["user"]["username"]
-            } for user in users]
+            Follower(
+                user["user"]["id"],
+                user["created_at"],
+                user["user"]["name"],
+                user["user"]["username"]
+            ) for user in users]
     elif users:
-        return {
-            "id": users["user"]["id"],
-            "created_at": users["created_at"],
-            "name":  users["user"]["name"],
-            "username":  users["user"]["username"]
-        }
+        return Follower(
+            users["user"]["id"],
+            users["created_at"],
+            users["user"]["name"],
+            users["user"]["username"]
+        )
 
 
 def parse_votes(votes):
     if isinstance(votes, list):
         return [
-            {
-                "id": vote["id"],
-                "created_at": vote["created_at"],
-                "post_id": vote["post_id"],
-                "user_id": vote["user_id"]
-            } for vote in votes]
+            Vote(
+                vote["id"],
+                vote["created_at"],
+                vote["post_id"],
+                vote["user_id"]
+            ) for vote in votes]
     elif votes:
-        return {
-            "id": votes["id"],
-            "created_at": votes["created_at"],
-            "post_id": votes["post_id"],
-            "user_id": votes["user_id"]
-        }
+        return Vote(
+            votes["id"],
+            votes["created_at"],
+            votes["post_id"],
+            votes["user_id"]
+        )
 
 
 def parse_related_links(related_links):
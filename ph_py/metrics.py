@@ -0,0 +1,239 @@
+import threading
+from collections import defaultdict
+
+# upper bounds of the request latency histogram, in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+
+def route_template(route):
+    # "posts/123/comments" -> "posts/:id/comments", "users/rrhoover" -> "users/:username": one series per endpoint
+    parts = route.split("?")[0].split("/")
+    for i, part in enumerate(parts):
+        if part.isdigit():
+            parts[i] = ":id"
+        elif i == 1 and parts[0] == "users":
+            parts[i] = ":username"
+    return "/".join(parts)
+
+
+class Observer(object):
+    """ Receives the events of a client, subclasses override the ones they are interested in.
+
+    Events are sent synchronously from the thread (or event loop) that made the request, so they should be quick.
+    """
+
+    def on_request(self, method, route, status_code, seconds, size, error=None):
+        # one HTTP call, retries included; status_code is None and error is set when no response came back
+        pass
+
+    def on_retry(self, method, route, attempt, delay, reason):
+        pass
+
+    def on_decode(self, method, route, seconds, size):
+        # JSON decoding of a response body
+        pass
+
+    def on_parse(self, parser, seconds, items):
+        # models built from a decoded payload by the helpers function named `parser`
+        pass
+
+    def on_cache(self, route, hit):
+        pass
+
+    def on_rate_limit(self, remaining, reset_in):
+        # budget left after a response, and seconds until it resets
+        pass
+
+    def on_rate_limit_wait(self, seconds):
+        pass
+
+
+class _Histogram(object):
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        total = 0
+        buckets = []
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+
+class _Route(object):
+    __slots__ = ("statuses", "errors", "bytes", "latency", "decode_seconds", "cache_hits", "cache_misses", "retries")
+
+    def __init__(self):
+        self.statuses = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.bytes = 0
+        self.latency = _Histogram()
+        self.decode_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.retries = 0
+
+
+class Metrics(Observer):
+    """ Observer aggregating the events into per-route counters, latency histograms and rate-limit gauges """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.routes = defaultdict(_Route)
+            # parser name -> [calls, items, seconds]
+            self.parsers = defaultdict(lambda: [0, 0, 0.0])
+            self.rate_limit_remaining = None
+            self.rate_limit_reset_in = None
+            self.rate_limit_waits = 0
+            self.rate_limit_wait_seconds = 0.0
+
+    def on_request(self, method, route, status_code, seconds, size, error=None):
+        with self._lock:
+            metrics = self.routes[(method, route_template(route))]
+            if error is not None:
+                metrics.errors[type(error).__name__] += 1
+            else:
+                metrics.statuses[status_code] += 1
+                metrics.bytes += size
+            metrics.latency.observe(seconds)
+
+    def on_retry(self, method, route, attempt, delay, reason):
+        with self._lock:
+            self.routes[(method, route_template(route))].retries += 1
+
+    def on_decode(self, method, route, seconds, size):
+        with self._lock:
+            self.routes[(method, route_template(route))].decode_seconds += seconds
+
+    def on_parse(self, parser, seconds, items):
+        with self._lock:
+            metrics = self.parsers[parser]
+            metrics[0] += 1
+            metrics[1] += items
+            metrics[2] += seconds
+
+    def on_cache(self, route, hit):
+        with self._lock:
+            metrics = self.routes[("GET", route_template(route))]
+            if hit:
+                metrics.cache_hits += 1
+            else:
+                metrics.cache_misses += 1
+
+    def on_rate_limit(self, remaining, reset_in):
+        with self._lock:
+            self.rate_limit_remaining = remaining
+            self.rate_limit_reset_in = reset_in
+
+    def on_rate_limit_wait(self, seconds):
+        with self._lock:
+            self.rate_limit_waits += 1
+            self.rate_limit_wait_seconds += seconds
+
+    def snapshot(self):
+        with self._lock:
+            routes = {}
+            for (method, route), metrics in sorted(self.routes.items()):
+                routes["%s %s" % (method, route)] = {
+                    "requests": sum(metrics.statuses.values()) + sum(metrics.errors.values()),
+                    "statuses": dict(metrics.statuses),
+                    "errors": dict(metrics.errors),
+                    "bytes": metrics.bytes,
+                    "latency": {
+                        "count": metrics.latency.count,
+                        "sum": metrics.latency.sum,
+                        "buckets": metrics.latency.cumulative()
+                    },
+                    "decode_seconds": metrics.decode_seconds,
+                    "cache_hits": metrics.cache_hits,
+                    "cache_misses": metrics.cache_misses,
+                    "retries": metrics.retries
+                }
+            parsers = dict((name, {"calls": calls, "items": items, "seconds": seconds})
+                           for name, (calls, items, seconds) in sorted(self.parsers.items()))
+            return {
+                "routes": routes,
+                "parsers": parsers,
+                "rate_limit": {
+                    "remaining": self.rate_limit_remaining,
+                    "reset_in": self.rate_limit_reset_in,
+                    "waits": self.rate_limit_waits,
+                    "wait_seconds": self.rate_limit_wait_seconds
+                }
+            }
+
+    def prometheus(self, prefix="ph_client"):
+        # the snapshot in the Prometheus text exposition format
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name, kind, samples):
+            lines.append("# TYPE %s_%s %s" % (prefix, name, kind))
+            for labels, value in samples:
+                label_text = ",".join('%s="%s"' % (key, str(label).replace('"', '\\"')) for key, label in labels)
+                lines.append("%s_%s%s %s" % (prefix, name, "{%s}" % label_text if label_text else "", _number(value)))
+
+        routes = [(key.split(" ", 1), metrics) for key, metrics in snapshot["routes"].items()]
+        metric("requests_total", "counter",
+               [((("method", method), ("route", route), ("status", status)), count)
+                for (method, route), metrics in routes for status, count in sorted(metrics["statuses"].items())])
+        metric("request_errors_total", "counter",
+               [((("method", method), ("route", route), ("error", error)), count)
+                for (method, route), metrics in routes for error, count in sorted(metrics["errors"].items())])
+        metric("response_bytes_total", "counter",
+               [((("method", method), ("route", route)), metrics["bytes"]) for (method, route), metrics in routes])
+
+        lines.append("# TYPE %s_request_duration_seconds histogram" % prefix)
+        for (method, route), metrics in routes:
+            labels = 'method="%s",route="%s"' % (method, route)
+            for bound, count in metrics["latency"]["buckets"]:
+                lines.append('%s_request_duration_seconds_bucket{%s,le="%s"} %d' %
+                             (prefix, labels, "+Inf" if bound == float("inf") else bound, count))
+            lines.append("%s_request_duration_seconds_sum{%s} %s" % (prefix, labels,
+                                                                       _number(metrics["latency"]["sum"])))
+            lines.append("%s_request_duration_seconds_count{%s} %d" % (prefix, labels, metrics["latency"]["count"]))
+
+        metric("decode_seconds_total", "counter",
+               [((("method", method), ("route", route)), metrics["decode_seconds"])
+                for (method, route), metrics in routes if metrics["decode_seconds"]])
+        cache_results = (("hit", "cache_hits"), ("miss", "cache_misses"))
+        metric("cache_requests_total", "counter",
+               [((("route", route), ("result", result)), metrics[field])
+                for (method, route), metrics in routes for result, field in cache_results
+                if metrics["cache_hits"] or metrics["cache_misses"]])
+        metric("retries_total", "counter",
+               [((("method", method), ("route", route)), metrics["retries"]) for (method, route), metrics in routes
+                if metrics["retries"]])
+        metric("parse_seconds_total", "counter",
+               [((("parser", name),), parser["seconds"]) for name, parser in snapshot["parsers"].items()])
+        metric("parsed_items_total", "counter",
+               [((("parser", name),), parser["items"]) for name, parser in snapshot["parsers"].items()])
+
+        rate_limit = snapshot["rate_limit"]
+        if rate_limit["remaining"] is not None:
+            metric("rate_limit_remaining", "gauge", [((), rate_limit["remaining"])])
+            metric("rate_limit_reset_seconds", "gauge", [((), rate_limit["reset_in"])])
+        metric("rate_limit_waits_total", "counter", [((), rate_limit["waits"])])
+        metric("rate_limit_wait_seconds_total", "counter", [((), rate_limit["wait_seconds"])])
+        return "\n".join(lines) + "\n"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
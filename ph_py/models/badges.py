@@ -1,4 +1,5 @@
 class Badge(object):
+    __slots__ = ("id", "type", "date", "period", "position")
 
     def __init__(self, badge_id, badge_type, date, period, position):
         self.id = badge_id
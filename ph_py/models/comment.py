@@ -1,9 +1,12 @@
+from .. import helpers
+
+
 class Comment:
+    __slots__ = ("id", "body", "created_at", "post_id", "parent_comment_id", "user_id", "child_comments_count", "maker",
+                 "user", "child_comments")
 
     def __init__(self, comment_id, body, created_at, post_id, parent_comment_id, user_id,
                  child_comments_count, maker, user, child_comments=None):
-        from .. import helpers
-
         self.id = comment_id
         self.body = body
         self.created_at = created_at
@@ -17,12 +20,19 @@ class Comment:
 
     @staticmethod
     def build_comment_tree(children):
-        from .. import helpers
-
+        # walks the replies with an explicit stack rather than recursing once per level, so that deep threads
+        # don't get close to the recursion limit
         child_objects = []
+        stack = [(child_objects, children)]
 
-        for child in children:
-            to_insert = helpers.parse_comments(child)
-            child_objects.append(to_insert)
+        while stack:
+            siblings, raw_children = stack.pop()
+            for child in raw_children or ():
+                comment = Comment(child["id"], child["body"], child["created_at"], child["post_id"],
+                                  child["parent_comment_id"], child["user_id"], child["child_comments_count"],
+                                  child["maker"], child["user"])
+                siblings.append(comment)
+                if child["child_comments"]:
+                    stack.append((comment.child_comments, child["child_comments"]))
 
         return child_objects
@@ -0,0 +1,126 @@
+class CommentForest(object):
+    """ All the comment threads of a post, indexed by comment id and by parent """
+
+    def __init__(self, comments=None):
+        self.roots = []
+        self.by_id = {}
+        # parent comment id (None for top-level comments) -> replies
+        self.children = {None: self.roots}
+        self.depths = {}
+        self.subtree_sizes = {}
+        # parent comment id -> replies that came before it, kept among the roots until it comes
+        self.orphans = {}
+        if comments:
+            self.add(comments)
+
+    def add(self, comments):
+        # indexes parsed comments (with their replies) into the forest, walking the trees with an explicit stack.
+        # A comment whose parent is already in the forest becomes one of its replies; ones already indexed are skipped.
+        # A reply whose parent isn't known yet, as when pages come newest first, is a root until its parent is added.
+        added = []
+        new_ids = set()
+        attached = []
+        for comment in comments:
+            if comment.id in self.by_id:
+                continue
+            parent_id = comment.parent_comment_id
+            if parent_id in self.by_id:
+                if parent_id not in new_ids:
+                    attached.append(comment)
+            else:
+                if parent_id is not None:
+                    self.orphans.setdefault(parent_id, []).append(comment)
+                parent_id = None
+            # for a known parent this is the very list of its child_comments
+            self.children[parent_id].append(comment)
+
+            stack = [(comment, self.depths[parent_id] + 1 if parent_id is not None else 0)]
+            while stack:
+                node, depth = stack.pop()
+                self.by_id[node.id] = node
+                self.depths[node.id] = depth
+                self.children[node.id] = node.child_comments
+                added.append(node)
+                new_ids.add(node.id)
+                for child in node.child_comments:
+                    # a reply indexed already, waiting for this comment, is adopted below
+                    if child.id not in self.by_id:
+                        stack.append((child, depth + 1))
+
+        # the replies waiting for one of the comments added move under it, with all of their own replies
+        adopted = set()
+        for node in added:
+            for orphan in self.orphans.pop(node.id, ()):
+                replies = [child.id for child in node.child_comments]
+                if orphan.id in replies:
+                    # the copy nested in the parent gives way to the comment indexed with all of its replies
+                    node.child_comments[replies.index(orphan.id)] = orphan
+                else:
+                    node.child_comments.append(orphan)
+                adopted.add(orphan.id)
+                self._set_depths(orphan, self.depths[node.id] + 1)
+        if adopted:
+            self.roots[:] = [root for root in self.roots if root.id not in adopted]
+
+        # sizes of the comments added, their replies first; the replies adopted from before already have theirs
+        for node in added:
+            stack = [node]
+            while stack:
+                top = stack[-1]
+                if top.id in self.subtree_sizes:
+                    stack.pop()
+                    continue
+                pending = [child for child in top.child_comments if child.id not in self.subtree_sizes]
+                if pending:
+                    stack.extend(pending)
+                else:
+                    stack.pop()
+                    self.subtree_sizes[top.id] = 1 + sum(self.subtree_sizes[child.id] for child in top.child_comments)
+        for comment in attached:
+            # replies to comments indexed before this call grow the size of all of their ancestors
+            ancestor = self.by_id.get(comment.parent_comment_id)
+            while ancestor is not None:
+                self.subtree_sizes[ancestor.id] += self.subtree_sizes[comment.id]
+                ancestor = self.by_id.get(ancestor.parent_comment_id)
+
+    def _set_depths(self, comment, depth):
+        stack = [(comment, depth)]
+        while stack:
+            node, depth = stack.pop()
+            self.depths[node.id] = depth
+            for child in node.child_comments:
+                stack.append((child, depth + 1))
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, comment_id):
+        return comment_id in self.by_id
+
+    def __iter__(self):
+        for root in self.roots:
+            for comment in self.iter_thread(root.id):
+                yield comment
+
+    def get(self, comment_id):
+        return self.by_id.get(comment_id)
+
+    def parent(self, comment_id):
+        return self.by_id.get(self.by_id[comment_id].parent_comment_id)
+
+    def replies(self, comment_id):
+        return self.children.get(comment_id, [])
+
+    def depth(self, comment_id):
+        return self.depths[comment_id]
+
+    def subtree_size(self, comment_id):
+        return self.subtree_sizes[comment_id]
+
+    def iter_thread(self, comment_id):
+        # the comment and all of its replies, depth first in the order they were posted
+        stack = [self.by_id[comment_id]]
+        while stack:
+            comment = stack.pop()
+            yield comment
+            stack.extend(reversed(comment.child_comments))
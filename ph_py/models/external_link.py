@@ -1,4 +1,5 @@
 class ExternalLink:
+    __slots__ = ("id", "url", "title", "description", "author", "source", "favicon_image_uuid", "link_type")
 
     def __init__(self, external_link_id, url, title, description, author, source, favicon_image_uuid, link_type):
         self.id = external_link_id
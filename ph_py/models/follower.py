@@ -0,0 +1,11 @@
+from .record import Record
+
+
+class Follower(Record):
+    __slots__ = ("id", "created_at", "name", "username")
+
+    def __init__(self, user_id, created_at, name, username):
+        self.id = user_id
+        self.created_at = created_at
+        self.name = name
+        self.username = username
@@ -1,4 +1,5 @@
 class InstallLink:
+    __slots__ = ("redirect_url", "platform", "created_at", "post_id")
 
     def __init__(self, platform, created_at, redirect_url, post_id):
         self.redirect_url = redirect_url
@@ -0,0 +1,44 @@
+from threading import RLock
+
+from .. import helpers
+
+# what the parsed slot of a field holds until its first access
+_UNPARSED = object()
+# taken by first accesses only, so that a field shared between threads is parsed once
+_parse_lock = RLock()
+
+
+class LazyField(object):
+    """ Attribute kept as raw JSON and parsed by one of the helpers on first access.
+
+    The raw value lives in the `_<name>` slot of the instance and the parsed one in its `_<name>_parsed` slot, unset
+    until then: once parsed, an access is a single attribute read.
+    """
+
+    def __init__(self, parser):
+        # name of the helpers function parsing the field, looked up on use since helpers imports the models
+        self.parser = parser
+        self.name = None
+        self.slot = None
+        self.parsed_slot = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.slot = "_" + name
+        self.parsed_slot = "_%s_parsed" % name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = getattr(instance, self.parsed_slot, _UNPARSED)
+        if value is _UNPARSED:
+            with _parse_lock:
+                value = getattr(instance, self.parsed_slot, _UNPARSED)
+                if value is _UNPARSED:
+                    value = getattr(helpers, self.parser)(getattr(instance, self.slot))
+                    setattr(instance, self.parsed_slot, value)
+        return value
+
+    def __set__(self, instance, value):
+        setattr(instance, self.slot, value)
+        setattr(instance, self.parsed_slot, value)
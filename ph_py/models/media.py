@@ -1,4 +1,6 @@
 class Media(object):
+    __slots__ = ("id", "kindle_asin", "media_type", "priority", "platform", "video_id", "original_width",
+                 "original_height", "image_url", "metadata_url")
 
     def __init__(self, media_id, kindle_asin, media_type, priority, platform, video_id, original_width,
                  original_height, image_url, metadata_url):
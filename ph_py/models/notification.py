@@ -1,8 +1,10 @@
+from .. import helpers
+
+
 class Notification:
+    __slots__ = ("notification_id", "body", "seen", "sentence", "type", "reference", "from_user", "to_user")
 
     def __init__(self, notification_id, body, seen, sentence, type, reference, from_user, to_user):
-        from .. import helpers
-
         self.notification_id = notification_id
         self.body = body
         self.seen = seen
@@ -1,4 +1,30 @@
+from .lazy import LazyField
+
+
 class Post:
+    __slots__ = ("id", "name", "tagline", "created_at", "day", "comments_count", "votes_count", "discussion_url",
+                 "redirect_url", "screenshot_url", "maker_inside", "current_user", "description", "featured",
+                 "exclusive", "product_state", "category_id", "reviews_count", "positive_reviews_count",
+                 "negative_reviews_count", "neutral_reviews_count",
+                 # raw JSON of the lazy fields below, and the objects parsed from it on first access
+                 "_user", "_comments", "_votes", "_related_links", "_install_links", "_makers", "_platforms", "_topics",
+                 "_external_links", "_badges", "_related_posts", "_media",
+                 "_user_parsed", "_comments_parsed", "_votes_parsed", "_related_links_parsed",
+                 "_install_links_parsed", "_makers_parsed", "_platforms_parsed", "_topics_parsed",
+                 "_external_links_parsed", "_badges_parsed", "_related_posts_parsed", "_media_parsed")
+
+    user = LazyField("parse_users")
+    comments = LazyField("parse_comments")
+    votes = LazyField("parse_votes")
+    related_links = LazyField("parse_related_links")
+    install_links = LazyField("parse_install_links")
+    makers = LazyField("parse_users")
+    platforms = LazyField("parse_platforms")
+    topics = LazyField("parse_topics")
+    external_links = LazyField("parse_external_links")  # around the web
+    badges = LazyField("parse_badges")
+    related_posts = LazyField("parse_related_posts")
+    media = LazyField("parse_media")
 
     def __init__(self, post_id, name, tagline, created_at, day, comments_count, votes_count, discussion_url,
                  redirect_url, screenshot_url, maker_inside, user, current_user, comments=None, votes=None,
@@ -7,8 +33,6 @@ class Post:
                  category_id=None, badges=None, reviews_count=None, positive_reviews_count=None,
                  negative_reviews_count=None, neutral_reviews_count=None, makers=None, platforms=None):
 
-        from .. import helpers
-
         self.id = post_id
         self.name = name
         self.tagline = tagline
@@ -21,11 +45,11 @@ class Post:
         self.screenshot_url = screenshot_url
         self.maker_inside = maker_inside
         self.current_user = current_user
-        self.user = helpers.parse_users(user)
-        self.comments = helpers.parse_comments(comments)
-        self.votes = helpers.parse_votes(votes)
-        self.related_links = helpers.parse_related_links(related_links)
-        self.install_links = helpers.parse_install_links(install_links)
+        self._user = user
+        self._comments = comments
+        self._votes = votes
+        self._related_links = related_links
+        self._install_links = install_links
         #
         self.description = description
         self.featured = featured
@@ -36,10 +60,10 @@ class Post:
         self.positive_reviews_count = positive_reviews_count
         self.negative_reviews_count = negative_reviews_count
         self.neutral_reviews_count = neutral_reviews_count
-        self.makers = helpers.parse_users(makers)
-        self.platforms = helpers.parse_platforms(platforms)
-        self.topics = helpers.parse_topics(topics)
-        self.external_links = helpers.parse_external_links(external_links)  # around the web
-        self.badges = helpers.parse_badges(badges)
-        self.related_posts = helpers.parse_related_posts(related_posts)
-        self.media = helpers.parse_media(media)
+        self._makers = makers
+        self._platforms = platforms
+        self._topics = topics
+        self._external_links = external_links
+        self._badges = badges
+        self._related_posts = related_posts
+        self._media = media
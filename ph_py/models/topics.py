@@ -1,4 +1,5 @@
 class Topic(object):
+    __slots__ = ("id", "name", "slug")
 
     def __init__(self, topic_id, name, slug):
         self.id = topic_id
@@ -1,4 +1,8 @@
 class User:
+    __slots__ = ("id", "name", "headline", "created_at", "username", "image_url", "profile_url", "twitter_username",
+                 "website_url", "collections_count", "followed_topics_count", "followers", "followers_count",
+                 "followings", "followings_count", "header_image_url", "maker_of", "maker_of_count", "posts",
+                 "posts_count", "votes", "votes_count")
 
     def __init__(self, user_id, name, headline, created_at, username, image_url, profile_url, twitter_username,
                  website_url, collections_count=None, followed_topics_count=None, followers=None, followers_count=None,
@@ -2,9 +2,12 @@ from ph_py.models.user import User
 
 
 class UserDetails:
+    __slots__ = ("user", "votes_count", "posts_count", "maker_of_count", "email", "role", "permissions",
+                 "notifications", "first_time_user")
 
     def __init__(self, user_id, name, headline, created_at, username, image_url, profile_url, votes_count, posts_count,
-                 maker_of_count, email, role, permissions, notifications, first_time_user):
+                 maker_of_count, email, role, permissions, notifications, first_time_user, twitter_username=None,
+                 website_url=None):
         self.user = User(
             user_id,
             name,
@@ -12,7 +15,9 @@ class UserDetails:
             created_at,
             username,
             image_url,
-            profile_url
+            profile_url,
+            twitter_username,
+            website_url
         )
         self.votes_count = votes_count
         self.posts_count = posts_count
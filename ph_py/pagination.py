@@ -0,0 +1,77 @@
+from datetime import datetime
+from datetime import timezone
+
+# the API never returns more than this many records per call
+MAX_PER_PAGE = 100
+
+
+def parse_timestamp(value):
+    if value is None or isinstance(value, datetime):
+        timestamp = value
+    else:
+        timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if timestamp is not None and timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+class Cursor(object):
+    """ State of a walk through an older/newer endpoint, from the newest record down to the oldest with `older`, or
+    with order="asc" from the oldest record up with `newer` """
+
+    def __init__(self, data=None, max_items=None, stop=None, since=None):
+        self.data = dict(data or {})
+        self.max_items = max_items
+        self.stop = stop
+        self.since = parse_timestamp(since)
+        self.count = 0
+        self.done = max_items is not None and max_items <= 0
+        self.ascending = self.data.get("order") == "asc"
+        if self.ascending and self.since is not None:
+            # records created before `since` come first on an ascending walk, it would stop at once
+            raise ValueError("since only applies to walks from the newest record, not with order='asc'")
+
+    def params(self):
+        params = dict(self.data)
+        if self.max_items is not None and "per_page" in params:
+            params["per_page"] = min(params["per_page"], self.max_items - self.count)
+        return params
+
+    def is_past_stop(self, item):
+        if self.stop is not None and self.stop(item):
+            return True
+        if self.since is not None and item.get("created_at"):
+            return parse_timestamp(item["created_at"]) < self.since
+        return False
+
+    def advance(self, items, requested):
+        # returns the records of the page that belong to the walk, and moves the cursor past them
+        if not items:
+            self.done = True
+            return items
+
+        kept = items
+        for i, item in enumerate(items):
+            if self.is_past_stop(item):
+                kept = items[:i]
+                self.done = True
+                break
+        if self.max_items is not None and self.count + len(kept) >= self.max_items:
+            kept = kept[:self.max_items - self.count]
+            self.done = True
+        self.count += len(kept)
+
+        # the id past which the next page starts: the oldest seen, or the newest on an ascending walk
+        if self.ascending:
+            bound, position = "newer", max(item["id"] for item in items)
+            moved = self.data.get(bound) is None or position > self.data[bound]
+        else:
+            bound, position = "older", min(item["id"] for item in items)
+            moved = self.data.get(bound) is None or position < self.data[bound]
+        if not moved:
+            self.done = True
+        # a short page is the last one, no need to ask for the empty page after it
+        if requested is not None and len(items) < min(requested, MAX_PER_PAGE):
+            self.done = True
+        self.data[bound] = position
+        return kept
@@ -1,10 +1,19 @@
+import json
 import logging
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from time import perf_counter
 from time import sleep
+from urllib.parse import urlsplit
 
-import requests as r
-from simplejson.scanner import JSONDecodeError
-
+from .cache import request_key
+from .cache import stale_routes
 from .error import ProductHuntError
+from .models.comment_forest import CommentForest
 from .helpers import parse_comments
 from .helpers import parse_details
 from .helpers import parse_followings_or_followers
@@ -14,6 +23,13 @@ from .helpers import parse_related_links
 from .helpers import parse_user
 from .helpers import parse_users
 from .helpers import parse_votes
+from .pagination import Cursor
+from .pagination import MAX_PER_PAGE
+from .rate_limit import RateLimiter
+from .retry import DEFAULT_TIMEOUT
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .transport import RequestsTransport
 
 
 class ProductHuntClient:
@@ -21,23 +37,87 @@ class ProductHuntClient:
     API_BASE = "https://api.producthunt.com/v%d/" % API_VERSION
     ERROR_CODES = (401, 403, 404, 422)
     logger = logging.getLogger('ph_client')
-
-    def __init__(self, client_id, client_secret, redirect_uri, dev_token=None):
+    # lists of a user that the API cuts at 50: (field, field holding the full count, function paginating it)
+    USER_COLLECTIONS = (("votes", "votes_count", "get_user_votes"),
+                        ("followers", "followers_count", "get_user_followers"),
+                        ("followings", "followings_count", "get_user_followings"))
+
+    def __init__(self, client_id, client_secret, redirect_uri, dev_token=None, pool_connections=10, pool_maxsize=10,
+                 keep_alive=True, rate_limiter=None, max_workers=4, cache=None, store=None, json_loads=None,
+                 single_flight=True, retry_policy=None, circuit_breaker=None, timeout=DEFAULT_TIMEOUT, observers=None,
+                 transport=None):
         self.client_id = client_id
         self.client_secret = client_secret
         self.redirect_uri = redirect_uri
+        # sends the HTTP requests: a pooled requests session unless e.g. a transport.ReplayTransport is given
+        if transport is None:
+            transport = RequestsTransport(self.build_session(pool_connections, pool_maxsize, keep_alive))
+        self.transport = transport
+        self.session = getattr(transport, "session", None)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.max_workers = max_workers
+        self.cache = cache
+        self.store = store
+        # any function decoding JSON from bytes, e.g. orjson.loads
+        self.json_loads = json_loads if json_loads is not None else json.loads
+        self.single_flight = SingleFlight() if single_flight else None
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        # optional CircuitBreaker failing fast while the API is down
+        self.circuit_breaker = circuit_breaker
+        # seconds, or a (connect, read) tuple, passed to requests
+        self.timeout = timeout
+        # metrics.Observer instances told about every request, retry, decoding, parsing and cache lookup
+        self.observers = list(observers) if observers else []
 
         if dev_token:
             self.user_auth = {"access_token": dev_token}
         else:
             self.user_auth = None
 
-        self.client_auth = self.oauth_client_token()
+        # a client is shared by many threads, the lock makes them refresh the client token one at a time
+        self._auth_lock = threading.Lock()
+        self.client_auth = None
+        self.refresh_client_token()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def build_session(pool_connections, pool_maxsize, keep_alive):
+        # a single pooled session is shared by every request path, so the TCP+TLS handshake is paid once per host.
+        # requests is only imported here, importing it takes longer than everything else the client needs
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def close(self):
+        self.transport.close()
+
+    def add_observer(self, observer):
+        self.observers.append(observer)
+
+    def notify(self, event, *args):
+        # a failing observer is logged, it never fails the request it was told about
+        for observer in self.observers:
+            try:
+                getattr(observer, event)(*args)
+            except Exception:
+                self.logger.exception("Observer %r failed on %s" % (observer, event))
 
     def build_header(self, context):
         if context == "client":
             if self.client_auth is None:
-                self.oauth_client_token()
+                self.refresh_client_token()
 
             return {"Authorization": "Bearer %s" % self.client_auth["access_token"]}
         elif context == "user":
@@ -47,34 +127,132 @@ class ProductHuntClient:
             return {"Authorization": "Bearer %s" % self.user_auth["access_token"]}
 
     def make_request(self, method, route, data, context="", retry=False):
-        url = self.API_BASE + route
-
         headers = {}
         if context:
             headers = self.build_header(context)
 
+        key = None
         if method == "GET":
-            response = r.get(url, headers=headers, data=data)
-        elif method == "POST":
-            response = r.post(url, headers=headers, data=data)
-        elif method == "PUT":
-            response = r.put(url, headers=headers, data=data)
-        elif method == "DELETE":
-            response = r.delete(url, headers=headers, params=data)
-
+            key = request_key(method, route, data, context, headers)
+            if self.cache is not None:
+                cached = self.cache.get(key)
+                if self.observers:
+                    self.notify("on_cache", route, cached is not None)
+                if cached is not None:
+                    return cached
+            if self.single_flight is not None and not retry:
+                # an identical GET already in flight shares its response instead of spending another call
+                return self.single_flight.do(key, self._make_request, method, route, data, context, retry, headers,
+                                             key)
+        return self._make_request(method, route, data, context, retry, headers, key)
+
+    def _make_request(self, method, route, data, context, retry, headers, key):
+        response = self.send(method, self.API_BASE + route, headers, data)
+        if response.status_code == 429 or response.status_code >= 500:
+            # still failing after the retries allowed by the policy, the body is often an HTML error page
+            raise ProductHuntError("The Product Hunt API answered %d to %s %s" % (response.status_code, method, route),
+                                   response.status_code)
+
+        started = perf_counter()
         try:
-            json_data = response.json()
-            if response.status_code in self.ERROR_CODES:
-                if response.status_code == 401 and context == "client" and not retry:
-                    self.oauth_client_token()
-                    self.make_request(method, route, data, context, True)
-                else:
-                    raise ProductHuntError(json_data["error_description"], response.status_code)
-
-            return json_data
-        except JSONDecodeError as je:
+            json_data = self.json_loads(response.content)
+        except ValueError as je:
             self.logger.error(str(je))
             raise ProductHuntError("Error in parsing JSON from the Product Hunt API when making a request")
+        if self.observers:
+            self.notify("on_decode", method, route, perf_counter() - started, len(response.content))
+
+        if response.status_code in self.ERROR_CODES:
+            if response.status_code == 401 and context == "client" and not retry:
+                self.refresh_client_token(headers.get("Authorization"))
+                return self.make_request(method, route, data, context, True)
+            else:
+                raise ProductHuntError(json_data["error_description"], response.status_code)
+
+        if self.cache is not None:
+            if key is not None:
+                self.cache.set(key, json_data, len(response.content))
+            elif context:
+                for pattern in stale_routes(route):
+                    self.cache.invalidate(pattern)
+        return json_data
+
+    def send(self, method, url, headers, data):
+        # sends a request within the rate budget, trying the transient failures again as the retry policy allows
+        host = urlsplit(url).netloc
+        route = url[len(self.API_BASE):] if url.startswith(self.API_BASE) else url
+        attempt = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before(host)
+            try:
+                self.wait_if_no_rate_limit_remaining()
+                response = error = None
+                started = perf_counter()
+                try:
+                    response = self.transport.request(method, url, headers, data, self.timeout)
+                except self.transport.errors as e:
+                    error = e
+            except BaseException:
+                # the host never answered, so nothing is counted against it, but a trial request has to end for the
+                # circuit to close again
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.release(host)
+                raise
+            status_code = response.status_code if response is not None else None
+
+            if response is not None:
+                self.rate_limiter.update(response.headers)
+            if self.observers:
+                self.notify("on_request", method, route, status_code, perf_counter() - started,
+                            len(response.content) if response is not None else 0, error)
+                status = self.rate_limiter.status()
+                if status is not None:
+                    self.notify("on_rate_limit", *status)
+            if self.circuit_breaker is not None:
+                if error is not None or status_code >= 500:
+                    self.circuit_breaker.failure(host)
+                else:
+                    self.circuit_breaker.success(host)
+
+            delay = None
+            if self.retry_policy.should_retry(method, attempt, status_code, error):
+                delay = self.retry_policy.delay(attempt, status_code, getattr(response, "headers", None))
+            if delay is None:
+                if error is not None:
+                    raise ProductHuntError("Error connecting to the Product Hunt API: %s" % error)
+                return response
+
+            attempt += 1
+            self.logger.warning("%s %s failed (%s), retry %d in %.1fs" % (method, url, error or status_code, attempt,
+                                                                          delay))
+            if self.observers:
+                self.notify("on_retry", method, route, attempt, delay, error or status_code)
+            sleep(delay)
+
+    def get_stored(self, kind, key, route, context, refresh=False):
+        # raw response of a GET on `route`, read from the persistent store when it holds a fresh enough copy
+        if self.store is not None and not refresh:
+            response = self.store.get(kind, key)
+            if response is not None:
+                return response
+
+        response = self.make_request("GET", route, None, context)
+        if self.store is not None:
+            self.store.save(kind, key, response)
+        return response
+
+    def parse(self, parser, payload, raw=False):
+        # the decoded payload as it is in raw mode, the models built by `parser` otherwise
+        if raw:
+            return payload
+        if not self.observers:
+            return parser(payload)
+        started = perf_counter()
+        parsed = parser(payload)
+        items = len(payload) if isinstance(payload, list) else 1
+        self.notify("on_parse", parser.__name__, perf_counter() - started, items)
+        return parsed
 
     def build_authorize_url(self):
         url = self.API_BASE + "oauth/authorize?client_id=%s&redirect_uri=%s&response_type=code&scope=public private" % \
@@ -105,28 +283,36 @@ class ProductHuntClient:
         self.client_auth = self.make_request("POST", "oauth/token", data, "")
         return self.client_auth
 
+    def refresh_client_token(self, expired_header=None):
+        # serialized, so that the threads whose requests failed together with the same expired token cause one
+        # refresh: the first one gets a new token, the others find it already replaced and reuse it
+        with self._auth_lock:
+            if self.client_auth is None or expired_header == "Bearer %s" % self.client_auth["access_token"]:
+                self.oauth_client_token()
+            return self.client_auth
+
     # Post-related functions
-    def get_todays_posts(self, context="client"):
+    def get_todays_posts(self, context="client", raw=False):
         responses = self.make_request("GET", "posts", None, context)
         responses = responses["posts"]
 
-        return parse_posts(responses)
+        return self.parse(parse_posts, responses, raw)
 
-    def get_previous_days_posts(self, days_ago, context="client"):
+    def get_previous_days_posts(self, days_ago, context="client", raw=False):
         responses = self.make_request("GET", "posts", {"days_ago": days_ago}, context)
         responses = responses["posts"]
 
-        return parse_posts(responses)
+        return self.parse(parse_posts, responses, raw)
 
-    def get_specific_days_posts(self, day, context="client"):
+    def get_specific_days_posts(self, day, context="client", raw=False):
         responses = self.make_request("GET", "posts", {"day": day}, context)
         responses = responses["posts"]
 
-        return parse_posts(responses)
+        return self.parse(parse_posts, responses, raw)
 
-    def get_details_of_post(self, post_id, context="client"):
-        post = self.make_request("GET", "posts/%d" % post_id, None, context)
-        return parse_posts(post["post"])
+    def get_details_of_post(self, post_id, context="client", raw=False):
+        post = self.get_stored("post", post_id, "posts/%d" % post_id, context)
+        return self.parse(parse_posts, post["post"], raw)
 
     def create_a_post(self, url, name, tagline):
         data = {
@@ -140,27 +326,34 @@ class ProductHuntClient:
         return parse_posts(post["post"])
 
     def find_post_by_slug(self, slug, context="user"):
+        if self.store is not None:
+            post_id = self.store.get("slug", slug)
+            if post_id is not None:
+                return post_id
+
         post_id = None
         url = self.API_BASE + "posts/all"
         data = {
             "search[slug]": slug
         }
         headers = self.build_header(context)
-        response = r.get(url, headers=headers, data=data)
+        response = self.send("GET", url, headers, data)
         try:
-            json_data = response.json()
+            json_data = self.json_loads(response.content)
             if response.status_code in self.ERROR_CODES:
                 raise ProductHuntError(json_data["error_description"], response.status_code)
             else:
                 if json_data and json_data['posts']:
                     post_id = json_data['posts'][0]['id']
-        except JSONDecodeError as je:
+        except ValueError as je:
             self.logger.error(str(je))
             raise ProductHuntError("Error in parsing JSON from the Product Hunt API")
+        if self.store is not None and post_id is not None:
+            self.store.save("slug", slug, post_id)
         return post_id
 
     # Notification-related functions
-    def show_notifications(self, older=None, newer=None, per_page=100, order=None):
+    def show_notifications(self, older=None, newer=None, per_page=100, order=None, raw=False):
         data = {
             "per_page": per_page
         }
@@ -172,14 +365,29 @@ class ProductHuntClient:
             data["order"] = order
 
         notifications = self.make_request("GET", "notifications", data, "user")
-        return parse_notifications(notifications["notifications"])
+        return self.parse(parse_notifications, notifications["notifications"], raw)
+
+    def iter_notifications(self, older=None, newer=None, per_page=100, order=None, max_items=None, stop=None,
+                           since=None, raw=False):
+        data = {"per_page": per_page}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        for notifications in self.paginate("notifications", "notifications", data, "user", max_items, stop, since):
+            for notification in self.parse(parse_notifications, notifications, raw):
+                yield notification
 
     def clear_notifications(self):
         notifications = self.make_request("DELETE", "notifications", None, "user")
         return parse_notifications(notifications["notifications"])
 
     # User-related functions
-    def get_users(self, older=None, newer=None, per_page=100, order=None, context="client"):
+    def get_users(self, older=None, newer=None, per_page=100, order=None, context="client", raw=False):
         data = {"per_page": per_page}
 
         if older:
@@ -190,39 +398,96 @@ class ProductHuntClient:
             data["order"] = order
 
         users = self.make_request("GET", "users", data, context)
-        return parse_users(users["users"])
+        return self.parse(parse_users, users["users"], raw)
 
-    def get_user(self, username, context="client"):
-        user = self.make_request("GET", "users/%s" % username, None, context)
-        return parse_users(user["user"])
+    def iter_users(self, older=None, newer=None, per_page=100, order=None, context="client", max_items=None,
+                   stop=None, since=None, raw=False):
+        data = {"per_page": per_page}
 
-    def get_details_of_user(self, username, context="client"):
-        self.wait_if_no_rate_limit_remaining()
-        user = self.make_request("GET", "users/%s" % username, None, context)
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        for users in self.paginate("users", "users", data, context, max_items, stop, since):
+            for user in self.parse(parse_users, users, raw):
+                yield user
+
+    def get_user(self, username, context="client", raw=False):
+        user = self.get_stored("user", username, "users/%s" % username, context)
+        return self.parse(parse_users, user["user"], raw)
+
+    def get_details_of_user(self, username, context="client", raw=False):
+        user, u = self._load_user(username, context)
+        for field, count_field, getter in self.USER_COLLECTIONS:
+            count = getattr(u, count_field)
+            if count > 50:  # it is incomplete, retrieve as paginated
+                try:
+                    setattr(u, field, getattr(self, getter)(u.id, count=count, raw=raw))
+                except KeyError as ke:
+                    self.logger.warning(str(ke))
+        return self._user_details(user, u, raw)
+
+    def get_details_of_users(self, usernames, context="client", raw=False, max_workers=None):
+        # details of many users at once. Each username is fetched once, then the votes, followers and followings of
+        # every user are paginated as separate jobs, all by the same pool of workers drawing on the same rate budget.
+        # Returns (users, errors), both keyed by username: a failure only costs the user it happened to.
+        usernames = list(OrderedDict.fromkeys(usernames))
+        loaded = {}
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            pending = dict((executor.submit(self._load_user, username, context), (username, None))
+                           for username in usernames)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    username, field = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except KeyError as ke:
+                        if field is None:
+                            errors[username] = ke
+                        else:
+                            self.logger.warning(str(ke))
+                        continue
+                    except Exception as e:
+                        self.logger.warning("Failed getting the details of user %s: %s" % (username, e))
+                        errors[username] = e
+                        continue
+
+                    if field is not None:
+                        setattr(loaded[username][1], field, result)
+                        continue
+                    loaded[username] = result
+                    u = result[1]
+                    for collection, count_field, getter in self.USER_COLLECTIONS:
+                        count = getattr(u, count_field)
+                        if count > 50:  # pages are fetched one after the other, users are the unit of parallelism
+                            job = executor.submit(getattr(self, getter), u.id, per_page=MAX_PER_PAGE, context=context,
+                                                  count=count, max_workers=1, raw=raw)
+                            pending[job] = (username, collection)
+
+        users = OrderedDict((username, self._user_details(loaded[username][0], loaded[username][1], raw))
+                            for username in usernames if username in loaded and username not in errors)
+        return users, errors
+
+    def _load_user(self, username, context):
+        # raw payload and parsed User, fetched again if the stored copy cannot be parsed
+        user = self.get_stored("user", username, "users/%s" % username, context)
         try:
-            u = parse_user(user["user"])
+            return user["user"], parse_user(user["user"])
         except KeyError:
             self.logger.warning("Trying to recover from KeyError while getting `user` %s" % username)
-            user = self.make_request("GET", "users/%s" % username, None, context)
-            u = parse_user(user["user"])
-        if u.votes_count > 50:  # it is incomplete, retrieve as paginated
-            try:
-                u_votes = self.get_user_votes(u.id)
-                u.votes = u_votes
-            except KeyError as ke:
-                self.logger.warning(str(ke))
-        if u.followers_count > 50:  # it is incomplete, retrieve as paginated
-            try:
-                u_followers = self.get_user_followers(u.id)
-                u.followers = u_followers
-            except KeyError as ke:
-                self.logger.warning(str(ke))
-        if u.followings_count > 50:  # it is incomplete, retrieve as paginated
-            try:
-                u_followings = self.get_user_followings(u.id)
-                u.followings = u_followings
-            except KeyError as ke:
-                self.logger.warning(str(ke))
+            user = self.get_stored("user", username, "users/%s" % username, context, refresh=True)
+            return user["user"], parse_user(user["user"])
+
+    @staticmethod
+    def _user_details(user, u, raw):
+        if raw:
+            # the incomplete lists in the payload are replaced by the paginated ones
+            return dict(user, votes=u.votes, followers=u.followers, followings=u.followings)
         return u
 
     # Vote-related functions
@@ -235,8 +500,12 @@ class ProductHuntClient:
 
         return parse_votes(vote)
 
-    def get_user_votes(self, user_id, older=None, newer=None, per_page=50, order=None, context="client"):
-        votes_list = list()
+    def get_user_votes(self, user_id, older=None, newer=None, per_page=50, order=None, context="client", count=None,
+                       max_workers=None, raw=False):
+        return list(self.iter_user_votes(user_id, older, newer, per_page, order, context, count, max_workers, raw))
+
+    def iter_user_votes(self, user_id, older=None, newer=None, per_page=50, order=None, context="client", count=None,
+                        max_workers=None, raw=False):
         data = {"per_page": per_page, "page": 1}
 
         if older:
@@ -246,18 +515,16 @@ class ProductHuntClient:
         if order:
             data["order"] = order
 
-        self.wait_if_no_rate_limit_remaining()
-        votes = self.make_request("GET", "users/%d/votes" % user_id, data, context)
-        while votes["votes"]:
-            votes_list = votes_list + parse_votes(votes["votes"])
-            data["page"] = data["page"] + 1
-            self.wait_if_no_rate_limit_remaining()
-            votes = self.make_request("GET", "users/%d/votes" % user_id, data, context)
+        for votes in self._get_pages("users/%d/votes" % user_id, "votes", data, context, count, max_workers):
+            for vote in self.parse(parse_votes, votes, raw):
+                yield vote
 
-        return votes_list
+    def get_user_followers(self, user_id, older=None, newer=None, per_page=50, order=None, context="client",
+                           count=None, max_workers=None, raw=False):
+        return list(self.iter_user_followers(user_id, older, newer, per_page, order, context, count, max_workers, raw))
 
-    def get_user_followers(self, user_id, older=None, newer=None, per_page=50, order=None, context="client"):
-        followers_list = list()
+    def iter_user_followers(self, user_id, older=None, newer=None, per_page=50, order=None, context="client",
+                            count=None, max_workers=None, raw=False):
         data = {"per_page": per_page, "page": 1}
 
         if older:
@@ -267,18 +534,16 @@ class ProductHuntClient:
         if order:
             data["order"] = order
 
-        self.wait_if_no_rate_limit_remaining()
-        users = self.make_request("GET", "users/%d/followers" % user_id, data, context)
-        while users["followers"]:
-            followers_list = followers_list + parse_followings_or_followers(users["followers"])
-            data["page"] = data["page"] + 1
-            self.wait_if_no_rate_limit_remaining()
-            users = self.make_request("GET", "users/%d/followers" % user_id, data, context)
+        for users in self._get_pages("users/%d/followers" % user_id, "followers", data, context, count, max_workers):
+            for user in self.parse(parse_followings_or_followers, users, raw):
+                yield user
 
-        return followers_list
+    def get_user_followings(self, user_id, older=None, newer=None, per_page=50, order=None, context="client",
+                            count=None, max_workers=None, raw=False):
+        return list(self.iter_user_followings(user_id, older, newer, per_page, order, context, count, max_workers, raw))
 
-    def get_user_followings(self, user_id, older=None, newer=None, per_page=50, order=None, context="client"):
-        followers_list = list()
+    def iter_user_followings(self, user_id, older=None, newer=None, per_page=50, order=None, context="client",
+                             count=None, max_workers=None, raw=False):
         data = {"per_page": per_page, "page": 1}
 
         if older:
@@ -288,16 +553,50 @@ class ProductHuntClient:
         if order:
             data["order"] = order
 
-        self.wait_if_no_rate_limit_remaining()
-        users = self.make_request("GET", "users/%d/following" % user_id, data, context)
-        while users["following"]:
-            followers_list = followers_list + parse_followings_or_followers(users["following"])
+        for users in self._get_pages("users/%d/following" % user_id, "following", data, context, count, max_workers):
+            for user in self.parse(parse_followings_or_followers, users, raw):
+                yield user
+
+    def _get_pages(self, route, key, data, context, count=None, max_workers=None):
+        # yields the pages of a page-numbered endpoint in order, until an empty one comes back.
+        # When the total `count` is known, the pages it spans are fetched in parallel first.
+        if max_workers is None:
+            max_workers = self.max_workers
+        pages = int(math.ceil(count / float(data["per_page"]))) if count else 0
+
+        if pages > 1 and max_workers > 1:
+            def get_page(page):
+                return self.make_request("GET", route, dict(data, page=page), context)[key]
+
+            with ThreadPoolExecutor(max_workers=min(max_workers, pages)) as executor:
+                for items in executor.map(get_page, range(data["page"], data["page"] + pages)):
+                    if not items:
+                        return
+                    yield items
+            data["page"] = data["page"] + pages
+
+        # serially fetch whatever is left beyond the known count
+        items = self.make_request("GET", route, data, context)[key]
+        while items:
+            yield items
             data["page"] = data["page"] + 1
-            self.wait_if_no_rate_limit_remaining()
-            users = self.make_request("GET", "users/%d/following" % user_id, data, context)
-        return followers_list
-
-    def get_post_votes(self, post_id, older=None, newer=None, per_page=100, order=None, context="client"):
+            items = self.make_request("GET", route, data, context)[key]
+
+    def paginate(self, route, key, data=None, context="client", max_items=None, stop=None, since=None):
+        # yields the raw pages of an older/newer endpoint, from the newest record down to the oldest, by moving the
+        # `older` cursor past the oldest id seen; with {"order": "asc"} in data, from the oldest record up by moving
+        # `newer` past the newest id seen. The next page is only requested once the previous one has been consumed.
+        # The walk ends after `max_items` records, at the first record for which `stop(record)` is true or, walking
+        # down, at the first record created before `since`.
+        cursor = Cursor(data, max_items, stop, since)
+        while not cursor.done:
+            params = cursor.params()
+            items = self.make_request("GET", route, params, context)[key]
+            items = cursor.advance(items, params.get("per_page"))
+            if items:
+                yield items
+
+    def get_post_votes(self, post_id, older=None, newer=None, per_page=100, order=None, context="client", raw=False):
         data = {"per_page": per_page}
 
         if older:
@@ -308,10 +607,25 @@ class ProductHuntClient:
             data["order"] = order
 
         votes = self.make_request("GET", "posts/%d/votes" % post_id, data, context)
-        return parse_votes(votes["votes"])
+        return self.parse(parse_votes, votes["votes"], raw)
+
+    def iter_post_votes(self, post_id, older=None, newer=None, per_page=100, order=None, context="client",
+                        max_items=None, stop=None, since=None, raw=False):
+        data = {"per_page": per_page}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        for votes in self.paginate("posts/%d/votes" % post_id, "votes", data, context, max_items, stop, since):
+            for vote in self.parse(parse_votes, votes, raw):
+                yield vote
 
     # Comment-related functions
-    def get_comments(self, post_id, older=None, newer=None, per_page=100, order=None, context="client"):
+    def get_comments(self, post_id, older=None, newer=None, per_page=100, order=None, context="client", raw=False):
         data = {"per_page": per_page}
 
         if older:
@@ -322,7 +636,29 @@ class ProductHuntClient:
             data["order"] = order
 
         comments = self.make_request("GET", "posts/%d/comments" % post_id, data, context)
-        return parse_comments(comments["comments"])
+        return self.parse(parse_comments, comments["comments"], raw)
+
+    def iter_comments(self, post_id, older=None, newer=None, per_page=100, order=None, context="client",
+                      max_items=None, stop=None, since=None, raw=False):
+        data = {"per_page": per_page}
+
+        if older:
+            data["older"] = older
+        if newer:
+            data["newer"] = newer
+        if order:
+            data["order"] = order
+
+        for comments in self.paginate("posts/%d/comments" % post_id, "comments", data, context, max_items, stop, since):
+            for comment in self.parse(parse_comments, comments, raw):
+                yield comment
+
+    def get_full_comment_thread(self, post_id, per_page=100, context="client"):
+        # every comment of the post with all of its replies, indexed as they come in page by page
+        forest = CommentForest()
+        for comments in self.paginate("posts/%d/comments" % post_id, "comments", {"per_page": per_page}, context):
+            forest.add(parse_comments(comments))
+        return forest
 
     def create_comment(self, body, post_id, parent_comment_id=None):
         data = {
@@ -348,9 +684,9 @@ class ProductHuntClient:
         return parse_comments(comment["comment"])
 
     # User Detail related functions
-    def get_current_user_details(self):
+    def get_current_user_details(self, raw=False):
         details = self.make_request("GET", "me", None, "user")
-        return parse_details(details["user"])
+        return self.parse(parse_details, details["user"], raw)
 
     # Related-links functions
     def create_related_link(self, post_id, url, title=None):
@@ -374,35 +710,36 @@ class ProductHuntClient:
         return parse_related_links(related_link)
 
     def get_rate_limit_remaining(self):
+        # answered from the budget tracked on every response; only probes the API before the first call
+        status = self.rate_limiter.status()
+        if status is not None:
+            return status
+
         url = self.API_BASE + "me"
         headers = self.build_header("user")
-        response = r.get(url, headers=headers, data=None)
+        response = self.send("GET", url, headers, None)
         try:
-            json_data = response.json()
+            json_data = self.json_loads(response.content)
             if response.status_code in self.ERROR_CODES:
                 raise ProductHuntError(json_data["error_description"], response.status_code)
             else:
                 limit = response.headers['X-Rate-Limit-Remaining']
                 reset = response.headers['X-Rate-Limit-Reset']
                 return int(limit), int(reset)
-        except JSONDecodeError as je:
+        except ValueError as je:
             self.logger.warning(str(je))
             # raise ProductHuntError("Error in parsing JSON from the Product Hunt API when checking API limit")
             self.logger.warning("An error occurred parsing JSON when checking API limit")
 
     def wait_if_no_rate_limit_remaining(self):
-        try:
-            """ 900 API calls allowed every 15 minutes """
-            limit_remaining, reset = self.get_rate_limit_remaining()
-            if limit_remaining < 50:
-                self.logger.info(
-                    'API rate limit approaching, going to wait for about %s min until reset' % round(reset / 60, 1))
-                sleep(reset)
-                limit_remaining, reset = self.get_rate_limit_remaining()
-                self.logger.info("Resuming, API calls now remaining %s (%s min until reset)" % (limit_remaining,
-                                                                                                int(reset / 60)))
-            else:
-                self.logger.debug(
-                    "API calls remaining %s (about %s min until reset)" % (limit_remaining, round(reset / 60, 1)))
-        except TypeError as te:
-            self.logger.error("Trying to ignore error while checking API limits: %s" % str(te))
+        """ 900 API calls allowed every 15 minutes """
+        delay = self.rate_limiter.reserve()
+        if delay > 0:
+            self.logger.info(
+                'API rate limit approaching, going to wait for about %s min until reset' % round(delay / 60, 1))
+            if self.observers:
+                self.notify("on_rate_limit_wait", delay)
+            sleep(delay)
+            self.logger.info("Resuming, API calls now remaining %s" % self.rate_limiter.remaining)
+        elif self.rate_limiter.remaining is not None:
+            self.logger.debug("API calls remaining %s" % self.rate_limiter.remaining)
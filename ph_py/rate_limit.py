@@ -0,0 +1,70 @@
+import threading
+from time import monotonic
+
+
+class RateLimiter(object):
+    """ Local estimate of the API budget, kept up to date from the X-Rate-Limit-* response headers """
+
+    def __init__(self, limit=900, window=15 * 60, threshold=50):
+        self.limit = limit
+        self.window = window
+        self.threshold = threshold
+        self.remaining = None
+        self.reset_at = None
+        self.window_start = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, headers):
+        remaining = headers.get("X-Rate-Limit-Remaining")
+        reset = headers.get("X-Rate-Limit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining = int(remaining)
+            reset_at = monotonic() + int(reset)
+        except ValueError:
+            return
+
+        with self._lock:
+            if "X-Rate-Limit-Limit" in headers:
+                try:
+                    self.limit = int(headers["X-Rate-Limit-Limit"])
+                except ValueError:
+                    pass
+            if reset_at < self.window_start:
+                # late response from a window we already rolled past
+                return
+            if self.reset_at is None or self.remaining is None or reset_at > self.reset_at + 1:
+                self.remaining = remaining
+                self.reset_at = reset_at
+            else:
+                # same window: other calls may still be in flight, so keep the lower estimate
+                self.remaining = min(self.remaining, remaining)
+
+    def _roll(self, now):
+        while self.reset_at is not None and now >= self.reset_at:
+            self.window_start = self.reset_at
+            self.reset_at = self.reset_at + self.window
+            self.remaining = self.limit
+
+    def reserve(self):
+        # takes one call from the budget and returns how many seconds the caller must wait before making it
+        with self._lock:
+            now = monotonic()
+            self._roll(now)
+            if self.remaining is not None:
+                if self.remaining < self.threshold:
+                    # budget used up: the call goes into the next window
+                    self.window_start = self.reset_at
+                    self.reset_at = self.reset_at + self.window
+                    self.remaining = self.limit
+                self.remaining -= 1
+            return max(0.0, self.window_start - now)
+
+    def status(self):
+        with self._lock:
+            now = monotonic()
+            self._roll(now)
+            if self.remaining is None:
+                return None
+            return self.remaining, int(round(self.reset_at - now))
@@ -0,0 +1,124 @@
+import random
+import threading
+from time import monotonic
+from time import time
+
+from .error import ProductHuntError
+
+# responses worth trying again: too many requests and the transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# methods that can be repeated without doing their work twice
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+# seconds to connect and to wait between bytes of the response: a hung connection fails as a timeout, which is retried
+DEFAULT_TIMEOUT = (10, 60)
+
+
+def retry_after(headers):
+    # seconds to wait asked by the server in a Retry-After header, as a number of seconds or an HTTP date
+    value = headers.get("Retry-After") if headers else None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # an HTTP date is rare, and email.utils slow to import
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class RetryPolicy(object):
+    """ Which failed requests are tried again, and after how long """
+
+    def __init__(self, max_retries=3, backoff=0.5, max_backoff=60, jitter=True, statuses=RETRY_STATUSES,
+                 methods=IDEMPOTENT_METHODS, max_wait=15 * 60):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = statuses
+        self.methods = methods
+        # longest wait asked by the server that is honored, a longer one gives up
+        self.max_wait = max_wait
+
+    def should_retry(self, method, attempt, status_code=None, error=None):
+        if attempt >= self.max_retries or method not in self.methods:
+            return False
+        return error is not None or status_code in self.statuses
+
+    def delay(self, attempt, status_code=None, headers=None):
+        # seconds to wait before the attempt after `attempt` (0 for the first retry), None to give up
+        wait = retry_after(headers)
+        if wait is None and status_code == 429 and headers and headers.get("X-Rate-Limit-Reset") is not None:
+            try:
+                wait = max(0.0, float(headers["X-Rate-Limit-Reset"]))
+            except ValueError:
+                pass
+        if wait is not None:
+            return wait if wait <= self.max_wait else None
+
+        # exponential backoff with full jitter, so that clients failing together don't retry together
+        backoff = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+
+class CircuitOpenError(ProductHuntError):
+
+    def __init__(self, host, retry_in):
+        ProductHuntError.__init__(self, "Circuit open for %s after repeated failures, retrying in %.0fs" %
+                                  (host, retry_in))
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker(object):
+    """ Fails fast while a host is down: after `failures` consecutive failures the requests to it are refused for
+    `reset_timeout` seconds, then a single trial request decides whether it is back """
+
+    def __init__(self, failures=5, reset_timeout=30):
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        # host -> [consecutive failures, time the circuit opened or None, trial request in flight]
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def before(self, host):
+        # raises CircuitOpenError if no request may be sent to the host right now
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state[1] is None:
+                return
+            retry_in = state[1] + self.reset_timeout - monotonic()
+            if retry_in > 0 or state[2]:
+                raise CircuitOpenError(host, max(retry_in, 0))
+            state[2] = True
+
+    def success(self, host):
+        with self._lock:
+            self._hosts.pop(host, None)
+
+    def release(self, host):
+        # ends a trial request that got no answer either way, e.g. cancelled or failing in the client: the next request
+        # is the trial, and no failure is counted against the host
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is not None:
+                state[2] = False
+
+    def failure(self, host):
+        with self._lock:
+            state = self._hosts.setdefault(host, [0, None, False])
+            state[0] += 1
+            if state[2] or state[0] >= self.failures:
+                # a failed trial opens the circuit again for a full timeout
+                state[1] = monotonic()
+                state[2] = False
+
+    def is_open(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            return state is not None and state[1] is not None
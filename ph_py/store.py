@@ -0,0 +1,140 @@
+import json
+import os
+import sqlite3
+import threading
+from time import time
+
+DAY = 24 * 60 * 60
+
+# how long a stored object is considered fresh, by kind of object (None: forever)
+DEFAULT_MAX_AGES = {
+    "post": DAY,
+    "user": DAY,
+    "slug": None
+}
+
+
+class ObjectStore(object):
+    """ Base class of the persistent stores of raw API objects, subclasses implement load, save and delete """
+
+    def __init__(self, max_ages=None):
+        self.max_ages = dict(DEFAULT_MAX_AGES)
+        if max_ages:
+            self.max_ages.update(max_ages)
+
+    def is_fresh(self, kind, fetched_at):
+        max_age = self.max_ages.get(kind)
+        return max_age is None or time() - fetched_at <= max_age
+
+    def get(self, kind, key):
+        row = self.load(kind, key)
+        if row is not None:
+            payload, fetched_at = row
+            if self.is_fresh(kind, fetched_at):
+                return payload
+        return None
+
+    def load(self, kind, key):
+        # returns (payload, fetched_at) or None
+        raise NotImplementedError
+
+    def save(self, kind, key, payload, fetched_at=None):
+        raise NotImplementedError
+
+    def delete(self, kind, key=None):
+        raise NotImplementedError
+
+
+class SQLiteStore(ObjectStore):
+    """ Stores the raw JSON of the objects in a SQLite file, which several processes can share """
+
+    def __init__(self, path, max_ages=None, timeout=30):
+        ObjectStore.__init__(self, max_ages)
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        connection = self.connection()
+        # WAL lets readers in other processes go on while one of them writes
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS objects ("
+                           "kind TEXT NOT NULL, "
+                           "key TEXT NOT NULL, "
+                           "payload TEXT NOT NULL, "
+                           "fetched_at REAL NOT NULL, "
+                           "PRIMARY KEY (kind, key))")
+
+    def connection(self):
+        # sqlite3 connections cannot be shared between threads, each thread gets its own
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def load(self, kind, key):
+        row = self.connection().execute("SELECT payload, fetched_at FROM objects WHERE kind = ? AND key = ?",
+                                        (kind, str(key))).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def save(self, kind, key, payload, fetched_at=None):
+        if fetched_at is None:
+            fetched_at = time()
+        self.connection().execute("INSERT OR REPLACE INTO objects (kind, key, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                                  (kind, str(key), json.dumps(payload), fetched_at))
+
+    def delete(self, kind, key=None):
+        if key is None:
+            self.connection().execute("DELETE FROM objects WHERE kind = ?", (kind,))
+        else:
+            self.connection().execute("DELETE FROM objects WHERE kind = ? AND key = ?", (kind, str(key)))
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class JSONStore(ObjectStore):
+    """ Keeps the objects in memory and, given a path, in a JSON file rewritten on every save. Meant for small state
+    such as sync cursors, SQLiteStore suits the posts and users better """
+
+    def __init__(self, path=None, max_ages=None):
+        ObjectStore.__init__(self, max_ages)
+        self.path = path
+        self._objects = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            with open(path) as f:
+                self._objects = json.load(f)
+
+    def load(self, kind, key):
+        with self._lock:
+            row = self._objects.get(kind, {}).get(str(key))
+        return tuple(row) if row is not None else None
+
+    def save(self, kind, key, payload, fetched_at=None):
+        if fetched_at is None:
+            fetched_at = time()
+        with self._lock:
+            self._objects.setdefault(kind, {})[str(key)] = [payload, fetched_at]
+            self.write()
+
+    def delete(self, kind, key=None):
+        with self._lock:
+            if key is None:
+                self._objects.pop(kind, None)
+            else:
+                self._objects.get(kind, {}).pop(str(key), None)
+            self.write()
+
+    def write(self):
+        if self.path is None:
+            return
+        # written aside then renamed, so that a crash never leaves a half written file behind
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(self._objects, f)
+        os.replace(temporary, self.path)
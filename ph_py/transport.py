@@ -0,0 +1,141 @@
+import gzip
+import json
+import threading
+from collections import defaultdict
+from collections import deque
+from urllib.parse import urlsplit
+
+from .error import ProductHuntError
+
+# response headers the client reads, the only ones kept in a cassette
+RECORDED_HEADERS = ("Content-Type", "Retry-After", "X-Rate-Limit-Limit", "X-Rate-Limit-Remaining",
+                    "X-Rate-Limit-Reset")
+# requests whose parameters are credentials: never written to a cassette, nor matched on
+CREDENTIAL_ROUTES = ("oauth/token",)
+
+
+class Response(object):
+    """ The parts of a requests.Response the client uses """
+    __slots__ = ("status_code", "headers", "content")
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+
+class Transport(object):
+    """ Sends the HTTP requests of a client. `request` returns an object with status_code, headers and content, and
+    raises one of `errors` when no response comes back, which the client may retry """
+    errors = ()
+
+    def request(self, method, url, headers, data, timeout=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    """ Sends the requests through a pooled requests.Session """
+
+    def __init__(self, session):
+        import requests
+
+        self.session = session
+        self.errors = (requests.RequestException,)
+
+    def request(self, method, url, headers, data, timeout=None):
+        if method == "DELETE":
+            return self.session.delete(url, headers=headers, params=data, timeout=timeout)
+        return self.session.request(method, url, headers=headers, data=data, timeout=timeout)
+
+    def close(self):
+        self.session.close()
+
+
+def cassette_key(method, url, data):
+    # requests match on method, path and parameters: not on the host, so that a cassette can be replayed against any
+    # API_BASE, nor on the headers, which only carry the access token
+    path = urlsplit(url).path
+    if path.endswith(CREDENTIAL_ROUTES):
+        data = None
+    return "%s %s %s" % (method, path, json.dumps(data, sort_keys=True, default=str) if data else "")
+
+
+class RecordingTransport(Transport):
+    """ Sends the requests through another transport and appends every response to a gzipped JSON lines cassette.
+    Access tokens and client secrets are left out of it. """
+
+    def __init__(self, path, transport):
+        self.path = path
+        self.transport = transport
+        self.errors = transport.errors
+        self.recorded = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers, data, timeout=None):
+        response = self.transport.request(method, url, headers, data, timeout)
+        key = cassette_key(method, url, data)
+        content = response.content
+        if urlsplit(url).path.endswith(CREDENTIAL_ROUTES):
+            content = b'{"access_token": "recorded"}'
+        line = json.dumps({
+            "key": key,
+            "status": response.status_code,
+            "headers": dict((name, response.headers[name]) for name in RECORDED_HEADERS if name in response.headers),
+            # the bytes as they came, undecodable ones included
+            "body": content.decode("utf-8", "surrogateescape")
+        }, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self.recorded += 1
+        return response
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """ Answers the requests from a cassette, with no network at all. The responses recorded for a request are served
+    in their order, the last one again once they run out. A request that was never recorded raises ProductHuntError.
+
+    With `full_budget` the X-Rate-Limit-Remaining header is served as the whole limit, so that the client never waits
+    on a rate budget it doesn't spend; without it the budget recorded is replayed as is. """
+
+    def __init__(self, path, full_budget=True):
+        self.path = path
+        self.full_budget = full_budget
+        self.replayed = 0
+        self._responses = defaultdict(deque)
+        self._lock = threading.Lock()
+        self.load(path)
+
+    def load(self, path):
+        with gzip.open(path, "rt", encoding="utf-8") as cassette:
+            try:
+                for line in cassette:
+                    if not line.endswith("\n"):
+                        break
+                    recorded = json.loads(line)
+                    headers = recorded["headers"]
+                    if self.full_budget and "X-Rate-Limit-Remaining" in headers:
+                        headers["X-Rate-Limit-Remaining"] = headers.get("X-Rate-Limit-Limit", "900")
+                    self._responses[recorded["key"]].append(
+                        Response(recorded["status"], headers, recorded["body"].encode("utf-8", "surrogateescape")))
+            except EOFError:
+                # the recording process died before closing the file, the complete lines are kept
+                pass
+
+    def request(self, method, url, headers, data, timeout=None):
+        key = cassette_key(method, url, data)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise ProductHuntError("No response recorded for %s" % key)
+            response = responses.popleft() if len(responses) > 1 else responses[0]
+            self.replayed += 1
+        return response
@@ -41,13 +41,19 @@ setup(
 
         # Specify the Python versions you support here. In particular, ensure
         # that you indicate whether you support Python 2, Python 3 or both.
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.2',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
     ],
 
+    # async/await, asyncio.get_running_loop and module __getattr__ need Python 3.7
+    python_requires='>=3.7',
+
     # What does your project relate to?
     keywords=['api', 'product', 'hunt', 'product hunt'],
 
@@ -59,7 +65,15 @@ setup(
     # project is installed. For an analysis of "install_requires" vs pip's
     # requirements files see:
     # https://packaging.python.org/en/latest/technical.html#install-requires-vs-requirements-files
-    install_requires=['requests', 'simplejson'],
+    install_requires=['requests'],
+
+    # Optional dependencies, installed with e.g. `pip install ph_py[async]`
+    extras_require={
+        'async': ['aiohttp'],
+        'export': ['numpy', 'pyarrow'],
+        'graph': ['numpy'],
+        'analytics': ['numpy'],
+    },
 
     # If there are data files included in your packages that need to be
     # installed, specify them here.  If using Python 2.6 or less, then these
@@ -75,5 +89,9 @@ setup(
     # To provide executable scripts, use entry points in preference to the
     # "scripts" keyword. Entry points provide cross-platform support and allow
     # pip to create the appropriate form of executable for the target platform.
-    entry_points={},
+    entry_points={
+        'console_scripts': [
+            'ph-crawl = ph_py.crawler:main',
+        ],
+    },
 )
@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+
+from ph_py.async_client import AsyncSingleFlight
+
+
+class AsyncSingleFlightTest(unittest.TestCase):
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_coalesces_concurrent_calls(self):
+        async def scenario():
+            flight = AsyncSingleFlight()
+            calls = []
+
+            async def fetch():
+                calls.append(1)
+                await asyncio.sleep(0.01)
+                return "result"
+
+            results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+            return results, len(calls), flight.coalesced
+
+        results, calls, coalesced = self.run_async(scenario())
+        self.assertEqual(results, ["result"] * 5)
+        self.assertEqual(calls, 1)
+        self.assertEqual(coalesced, 4)
+
+    def test_cancelled_leader_hands_the_call_to_a_waiter(self):
+        async def scenario():
+            flight = AsyncSingleFlight()
+            calls = []
+
+            async def fetch():
+                calls.append(1)
+                await asyncio.sleep(0.05 if len(calls) == 1 else 0.01)
+                return "result"
+
+            # the leader gives up on its own, its waiters don't
+            leader = asyncio.ensure_future(asyncio.wait_for(flight.do("key", fetch), 0.01))
+            await asyncio.sleep(0)
+            waiters = [asyncio.ensure_future(flight.do("key", fetch)) for _ in range(3)]
+            with self.assertRaises(asyncio.TimeoutError):
+                await leader
+            results = await asyncio.gather(*waiters)
+            return results, len(calls), flight.coalesced
+
+        results, calls, coalesced = self.run_async(scenario())
+        self.assertEqual(results, ["result"] * 3)
+        self.assertEqual(calls, 2)
+        self.assertEqual(coalesced, 2)
+
+    def test_errors_reach_every_waiter(self):
+        async def scenario():
+            flight = AsyncSingleFlight()
+
+            async def fetch():
+                await asyncio.sleep(0.01)
+                raise ValueError("failed")
+
+            return await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)), return_exceptions=True)
+
+        results = self.run_async(scenario())
+        self.assertEqual([type(result) for result in results], [ValueError] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
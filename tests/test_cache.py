@@ -0,0 +1,68 @@
+import unittest
+
+from ph_py.cache import ResponseCache
+from ph_py.cache import request_key
+from ph_py.cache import route_matches
+from ph_py.cache import stale_routes
+
+
+def invalidate_write(cache, route):
+    for pattern in stale_routes(route):
+        cache.invalidate(pattern)
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache(ttl=60)
+
+    def fill(self, *routes):
+        for route in routes:
+            self.cache.set(request_key("GET", route, None, "client", {}), {"route": route})
+
+    def cached(self):
+        return sorted(key[1] for key in self.cache._entries)
+
+    def test_route_matches_whole_segments(self):
+        self.assertTrue(route_matches("posts/12", "posts/12"))
+        self.assertTrue(route_matches("posts/12", "posts/12/comments"))
+        self.assertFalse(route_matches("posts/12", "posts/123"))
+        self.assertFalse(route_matches("posts/12", "posts/1234/votes"))
+        self.assertTrue(route_matches("users/*/votes", "users/7/votes"))
+        self.assertFalse(route_matches("users/*/votes", "users/7/followers"))
+        self.assertTrue(route_matches("posts$", "posts"))
+        self.assertFalse(route_matches("posts$", "posts/12"))
+
+    def test_invalidate_doesnt_reach_other_ids(self):
+        self.fill("posts/12", "posts/12/comments", "posts/123", "posts/1234/votes")
+        self.cache.invalidate("posts/12")
+        self.assertEqual(self.cached(), ["posts/123", "posts/1234/votes"])
+
+    def test_update_comment_drops_the_comments_of_posts(self):
+        self.fill("posts/3/comments", "posts/3", "posts/3/votes", "comments/9", "users/1")
+        invalidate_write(self.cache, "comments/9")
+        self.assertEqual(self.cached(), ["posts/3/votes", "users/1"])
+
+    def test_vote_drops_the_post_and_the_votes_of_users(self):
+        self.fill("posts/12", "posts/12/votes", "posts/123", "posts", "users/7/votes", "users/7/followers", "me")
+        for route in ("posts/12/vote", "posts/12/vote"):
+            invalidate_write(self.cache, route)
+            self.assertEqual(self.cached(), ["posts/123", "users/7/followers"])
+            self.fill("posts/12", "posts/12/votes", "posts", "users/7/votes", "me")
+
+    def test_new_comment_and_related_links(self):
+        self.fill("posts/12/comments", "posts/12", "posts/120/comments", "posts")
+        invalidate_write(self.cache, "posts/12/comments")
+        self.assertEqual(self.cached(), ["posts/120/comments"])
+        self.fill("posts/12", "posts/120")
+        invalidate_write(self.cache, "posts/12/related_links/4")
+        self.assertEqual(self.cached(), ["posts/120", "posts/120/comments"])
+
+    def test_other_writes_drop_their_resource(self):
+        self.fill("users/5", "users/5/votes", "users/50")
+        invalidate_write(self.cache, "users/5/something")
+        self.assertEqual(self.cached(), ["users/50"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from ph_py import ProductHuntClient
+from ph_py.retry import CircuitBreaker
+from ph_py.retry import CircuitOpenError
+from ph_py.retry import DEFAULT_TIMEOUT
+from ph_py.retry import RetryPolicy
+from ph_py.transport import Response
+from ph_py.transport import Transport
+
+
+class FlakyTransport(Transport):
+    """ Answers every request with `status`, raising the queued exceptions first """
+
+    def __init__(self):
+        self.status = 200
+        self.raises = []
+
+    def request(self, method, url, headers, data, timeout=None):
+        if self.raises:
+            raise self.raises.pop(0)
+        return Response(self.status, {}, b'{"access_token": "token", "posts": []}')
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FlakyTransport()
+        self.breaker = CircuitBreaker(failures=1, reset_timeout=0)
+        self.client = ProductHuntClient("id", "secret", "http://localhost", dev_token="token",
+                                        retry_policy=RetryPolicy(max_retries=0), circuit_breaker=self.breaker,
+                                        transport=self.transport)
+        self.host = "api.producthunt.com"
+
+    def test_trial_closes_the_circuit(self):
+        self.breaker.failure(self.host)
+        self.assertTrue(self.breaker.is_open(self.host))
+        self.client.get_todays_posts(context="user")
+        self.assertFalse(self.breaker.is_open(self.host))
+
+    def test_exception_during_the_trial_releases_it(self):
+        self.breaker.failure(self.host)
+        self.transport.raises.append(RuntimeError("transport bug"))
+        with self.assertRaises(RuntimeError):
+            self.client.get_todays_posts(context="user")
+        # the trial got no answer: the circuit stays as it was, and the next call is the new trial
+        self.assertTrue(self.breaker.is_open(self.host))
+        self.assertEqual(self.client.get_todays_posts(context="user"), [])
+        self.assertFalse(self.breaker.is_open(self.host))
+
+    def test_client_side_errors_are_not_failures_of_the_host(self):
+        self.breaker.failures = 2
+        for _ in range(5):
+            self.transport.raises.append(RuntimeError("transport bug"))
+            with self.assertRaises(RuntimeError):
+                self.client.get_todays_posts(context="user")
+        self.assertFalse(self.breaker.is_open(self.host))
+
+    def test_finite_timeout_by_default(self):
+        self.assertEqual(self.client.timeout, DEFAULT_TIMEOUT)
+        self.assertTrue(all(0 < seconds < float("inf") for seconds in DEFAULT_TIMEOUT))
+
+    def test_open_circuit_refuses_requests(self):
+        self.breaker.reset_timeout = 60
+        self.breaker.failure(self.host)
+        with self.assertRaises(CircuitOpenError):
+            self.client.get_todays_posts(context="user")
+
+
+if __name__ == "__main__":
+    unittest.main()
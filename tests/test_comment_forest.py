@@ -0,0 +1,115 @@
+import unittest
+
+from ph_py.helpers import parse_comments
+from ph_py.models.comment_forest import CommentForest
+
+
+def comment(comment_id, parent=None, replies=()):
+    # raw comment of the API, as a post's comments list it
+    return {
+        "id": comment_id,
+        "body": "comment %d" % comment_id,
+        "created_at": "2015-06-01T10:00:00.000-07:00",
+        "post_id": 1,
+        "parent_comment_id": parent,
+        "user_id": 1,
+        "child_comments_count": len(replies),
+        "maker": False,
+        "user": None,
+        "child_comments": list(replies)
+    }
+
+
+class CommentForestTest(unittest.TestCase):
+
+    def test_nested_replies(self):
+        forest = CommentForest(parse_comments([
+            comment(1, replies=[comment(2, 1, replies=[comment(3, 2)]), comment(4, 1)]),
+            comment(5)
+        ]))
+        self.assertEqual(len(forest), 5)
+        self.assertEqual([root.id for root in forest.roots], [1, 5])
+        self.assertEqual([forest.depth(i) for i in (1, 2, 3, 4, 5)], [0, 1, 2, 1, 0])
+        self.assertEqual([forest.subtree_size(i) for i in (1, 2, 3, 4, 5)], [4, 2, 1, 1, 1])
+        self.assertEqual([c.id for c in forest], [1, 2, 3, 4, 5])
+        self.assertEqual(forest.parent(3).id, 2)
+
+    def test_reply_with_its_parent_in_one_batch(self):
+        forest = CommentForest(parse_comments([comment(1), comment(2, 1)]))
+        self.assertEqual(forest.subtree_size(1), 2)
+        self.assertEqual(forest.depth(2), 1)
+        self.assertEqual([c.id for c in forest.replies(1)], [2])
+
+    def test_incremental_add(self):
+        forest = CommentForest(parse_comments([comment(1, replies=[comment(2, 1)])]))
+        forest.add(parse_comments([comment(3, 2), comment(4, 3, replies=[comment(5, 4)])]))
+        self.assertEqual([forest.depth(i) for i in (1, 2, 3, 4, 5)], [0, 1, 2, 3, 4])
+        self.assertEqual([forest.subtree_size(i) for i in (1, 2, 3, 4, 5)], [5, 4, 3, 2, 1])
+
+        # comments already indexed are skipped, a reply to an unknown comment becomes a root
+        forest.add(parse_comments([comment(3, 2), comment(6, 99)]))
+        self.assertEqual(len(forest), 6)
+        self.assertEqual(forest.subtree_size(1), 5)
+        self.assertEqual(forest.depth(6), 0)
+        self.assertEqual([root.id for root in forest.roots], [1, 6])
+
+    def test_same_sizes_in_one_or_several_calls(self):
+        comments = [comment(1), comment(2, 1), comment(3, 2), comment(4, 1)]
+        at_once = CommentForest(parse_comments(comments))
+        one_by_one = CommentForest()
+        for raw in comments:
+            one_by_one.add(parse_comments([raw]))
+        for comment_id in (1, 2, 3, 4):
+            self.assertEqual(at_once.subtree_size(comment_id), one_by_one.subtree_size(comment_id))
+            self.assertEqual(at_once.depth(comment_id), one_by_one.depth(comment_id))
+
+    def assert_same_forest(self, forest, expected):
+        # roots are kept in the order they came
+        self.assertEqual(sorted(root.id for root in forest.roots), sorted(root.id for root in expected.roots))
+        self.assertEqual(sorted(forest.by_id), sorted(expected.by_id))
+        for comment_id in expected.by_id:
+            self.assertEqual(forest.depth(comment_id), expected.depth(comment_id))
+            self.assertEqual(forest.subtree_size(comment_id), expected.subtree_size(comment_id))
+            self.assertEqual(sorted(c.id for c in forest.replies(comment_id)),
+                             sorted(c.id for c in expected.replies(comment_id)))
+        self.assertEqual(sorted(c.id for c in forest), sorted(expected.by_id))
+
+    def test_reply_before_its_parent(self):
+        forest = CommentForest(parse_comments([comment(2, 1)]))
+        self.assertEqual([root.id for root in forest.roots], [2])
+        forest.add(parse_comments([comment(1)]))
+        self.assertEqual([root.id for root in forest.roots], [1])
+        self.assertEqual(forest.depth(2), 1)
+        self.assertEqual(forest.subtree_size(1), 2)
+        self.assertEqual(forest.parent(2).id, 1)
+        self.assertEqual(forest.orphans, {})
+
+    def test_newest_first_pages(self):
+        comments = [comment(1), comment(2, 1), comment(3, 2), comment(4, 1), comment(5), comment(6, 5), comment(7, 3)]
+        expected = CommentForest(parse_comments(comments))
+
+        one_by_one = CommentForest()
+        for raw in reversed(comments):
+            one_by_one.add(parse_comments([raw]))
+        self.assert_same_forest(one_by_one, expected)
+
+        self.assert_same_forest(CommentForest(parse_comments(comments[::-1])), expected)
+
+        pages = CommentForest()
+        pages.add(parse_comments(comments[5:]))
+        pages.add(parse_comments(comments[2:5]))
+        pages.add(parse_comments(comments[:2]))
+        self.assert_same_forest(pages, expected)
+
+    def test_parent_coming_with_its_replies_nested(self):
+        forest = CommentForest(parse_comments([comment(2, 1, replies=[comment(3, 2)])]))
+        forest.add(parse_comments([comment(1, replies=[comment(2, 1)])]))
+        self.assertEqual(len(forest), 3)
+        self.assertEqual([c.id for c in forest.replies(1)], [2])
+        self.assertEqual([forest.depth(i) for i in (1, 2, 3)], [0, 1, 2])
+        self.assertEqual([forest.subtree_size(i) for i in (1, 2, 3)], [3, 2, 1])
+        self.assertEqual([c.id for c in forest], [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from ph_py.crawler import hydrate_post
+
+
+class CachedClient(object):
+    """ Returns the same payload to every call, as a client with a ResponseCache does """
+
+    def __init__(self):
+        self.payload = {"post": {"id": 1, "name": "Post"}}
+
+    def get_stored(self, kind, key, route, context):
+        return self.payload
+
+    def paginate(self, route, key, data):
+        yield [{"id": 1}, {"id": 2}]
+
+
+class HydratePostTest(unittest.TestCase):
+
+    def test_cached_payload_left_unchanged(self):
+        client = CachedClient()
+        post = hydrate_post(client, {"id": 1}, votes=True, comments=True)
+        self.assertEqual([vote["id"] for vote in post["votes"]], [1, 2])
+        self.assertEqual(len(post["comments"]), 2)
+        self.assertEqual(client.payload, {"post": {"id": 1, "name": "Post"}})
+
+
+if __name__ == "__main__":
+    unittest.main()
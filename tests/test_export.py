@@ -0,0 +1,59 @@
+import random
+import unittest
+from unittest import mock
+from datetime import timezone
+
+import numpy
+
+from ph_py import export
+from ph_py.export import parse_timestamps
+from ph_py.pagination import parse_timestamp
+
+
+def expected(value):
+    timestamp = parse_timestamp(value).astimezone(timezone.utc).replace(tzinfo=None)
+    return numpy.datetime64(timestamp, "ms")
+
+
+class ParseTimestampsTest(unittest.TestCase):
+
+    def test_matches_single_parser(self):
+        rng = random.Random(0)
+        values = []
+        for _ in range(2000):
+            year, month = rng.randint(1970, 2030), rng.randint(1, 12)
+            day = rng.randint(1, 29 if month == 2 and year % 4 == 0 else 28 if month == 2 else 30)
+            value = "%04d-%02d-%02dT%02d:%02d:%02d" % (year, month, day, rng.randint(0, 23), rng.randint(0, 59),
+                                                       rng.randint(0, 59))
+            values.append(value + rng.choice((".123Z", "Z", ".5-08:00", "+05:30", ".000+00:00")))
+        self.assertEqual(parse_timestamps(values).tolist(), [expected(value).tolist() for value in values])
+
+    def test_leap_days(self):
+        self.assertEqual(str(parse_timestamps(["2016-02-29T12:00:00Z"])[0]), "2016-02-29T12:00:00.000")
+        self.assertEqual(str(parse_timestamps(["2000-02-29T12:00:00Z"])[0]), "2000-02-29T12:00:00.000")
+
+    def test_missing(self):
+        self.assertTrue(numpy.isnat(parse_timestamps([None, "2015-06-01T10:00:00Z"])[0]))
+
+    def test_out_of_range_rejected(self):
+        for value in ("2014-02-30T00:00:00Z", "2015-02-29T00:00:00Z", "1900-02-29T00:00:00Z", "2015-04-31T00:00:00Z",
+                      "2015-06-01T24:00:00Z", "2015-06-01T10:60:00Z", "2015-06-01T10:00:60Z",
+                      "2015-06-01T10:00:00+24:00", "2015-13-01T10:00:00Z"):
+            with self.assertRaises(ValueError, msg=value):
+                parse_timestamps(["2015-06-01T10:00:00Z", value])
+
+    def test_without_pyarrow(self):
+        values = ["2015-06-01T10:00:00.123Z", "2015-06-01T10:00:00.5-08:00", None, "2016-02-29 23:59:59+05:30"]
+        with_arrow = parse_timestamps(values)
+        with mock.patch.object(export, "_optional_pyarrow", lambda: None):
+            self.assertEqual(parse_timestamps(values).tolist(), with_arrow.tolist())
+            with self.assertRaises(ValueError):
+                parse_timestamps(["2015-06-01T10:00:00Z", "2014-02-30T00:00:00Z"])
+
+    def test_more_than_milliseconds(self):
+        # Arrow refuses to drop digits, NumPy truncates them
+        self.assertEqual(str(parse_timestamps(["2015-06-01T10:00:00.123456Z"])[0]), "2015-06-01T10:00:00.123")
+
+
+if __name__ == "__main__":
+    unittest.main()
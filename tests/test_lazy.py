@@ -0,0 +1,68 @@
+import threading
+import unittest
+
+from ph_py.models.post import Post
+from ph_py.models.user import User
+from ph_py.models.vote import Vote
+
+
+def user(user_id):
+    return {"id": user_id, "name": "User %d" % user_id, "headline": None, "created_at": "2015-06-01T10:00:00.000Z",
+            "username": "user%d" % user_id, "image_url": {}, "profile_url": None, "twitter_username": None,
+            "website_url": None}
+
+
+def post():
+    votes = [{"id": i, "created_at": "2015-06-01T10:00:00.000Z", "post_id": 1, "user_id": i} for i in range(1, 4)]
+    return Post(1, "Post", "Tagline", "2015-06-01T10:00:00.000Z", "2015-06-01", 0, 3, None, None, None, False,
+                user(1), None, votes=votes, makers=[user(2), user(3)])
+
+
+class LazyFieldTest(unittest.TestCase):
+
+    def test_parsed_on_first_access_only(self):
+        p = post()
+        self.assertIsInstance(p.user, User)
+        self.assertIs(p.user, p.user)
+        self.assertEqual([vote.id for vote in p.votes], [1, 2, 3])
+        self.assertIsInstance(p.votes[0], Vote)
+        # the raw JSON is kept as it came
+        self.assertEqual(p._user["id"], 1)
+        self.assertIsNone(p.comments)
+
+    def test_set(self):
+        p = post()
+        other = User(9, "Other", None, None, "other", {}, None, None, None)
+        p.user = other
+        self.assertIs(p.user, other)
+
+    def test_fields_first_accessed_from_several_threads(self):
+        fields = ("user", "votes", "makers", "comments", "topics")
+        for _ in range(50):
+            p = post()
+            barrier = threading.Barrier(len(fields) * 2)
+            results = {}
+            errors = []
+
+            def access(name, i):
+                barrier.wait()
+                try:
+                    results[name, i] = getattr(p, name)
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=access, args=(name, i)) for name in fields for i in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(errors, [])
+            for name in fields:
+                self.assertIs(results[name, 0], results[name, 1])
+                self.assertIs(getattr(p, name), results[name, 0])
+            self.assertIsInstance(p.user, User)
+            self.assertEqual([maker.id for maker in p.makers], [2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from ph_py.pagination import Cursor
+
+
+def endpoint(ids, params):
+    # the records an older/newer endpoint of the API returns for the params
+    selected = [i for i in ids if (params.get("older") is None or i < params["older"]) and
+                (params.get("newer") is None or i > params["newer"])]
+    ascending = params.get("order") == "asc"
+    selected.sort(reverse=not ascending)
+    return [{"id": i, "created_at": "2015-06-01T10:00:00.000Z"} for i in selected[:params.get("per_page", 100)]]
+
+
+def walk(ids, data, max_items=None):
+    cursor = Cursor(data, max_items)
+    seen = []
+    requests = 0
+    while not cursor.done:
+        params = cursor.params()
+        requests += 1
+        seen.extend(item["id"] for item in cursor.advance(endpoint(ids, params), params.get("per_page")))
+    return seen, requests
+
+
+class CursorTest(unittest.TestCase):
+
+    def test_newest_first(self):
+        ids = list(range(1, 26))
+        seen, requests = walk(ids, {"per_page": 10})
+        self.assertEqual(seen, list(range(25, 0, -1)))
+        self.assertEqual(requests, 3)
+
+    def test_descending_with_bounds(self):
+        seen, _ = walk(list(range(1, 26)), {"per_page": 10, "order": "desc", "older": 20, "newer": 5})
+        self.assertEqual(seen, list(range(19, 5, -1)))
+
+    def test_ascending(self):
+        ids = list(range(1, 26))
+        seen, requests = walk(ids, {"per_page": 10, "order": "asc"})
+        self.assertEqual(seen, ids)
+        self.assertEqual(requests, 3)
+
+    def test_ascending_with_bounds_and_max_items(self):
+        seen, _ = walk(list(range(1, 26)), {"per_page": 10, "order": "asc", "newer": 3, "older": 20})
+        self.assertEqual(seen, list(range(4, 20)))
+        seen, _ = walk(list(range(1, 26)), {"per_page": 10, "order": "asc"}, max_items=12)
+        self.assertEqual(seen, list(range(1, 13)))
+
+    def test_ascending_rejects_since(self):
+        with self.assertRaises(ValueError):
+            Cursor({"order": "asc"}, since="2015-06-01T00:00:00Z")
+
+
+if __name__ == "__main__":
+    unittest.main()
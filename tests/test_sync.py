@@ -0,0 +1,62 @@
+import json
+import unittest
+
+from ph_py import ProductHuntClient
+from ph_py.store import JSONStore
+from ph_py.sync import IncrementalSync
+from ph_py.transport import Response
+from ph_py.transport import Transport
+
+
+class VotesTransport(Transport):
+    """ Serves the votes of post 1 as the older/newer endpoint of the API does """
+
+    def __init__(self, n):
+        self.ids = list(range(1, n + 1))
+        self.calls = 0
+
+    def request(self, method, url, headers, data, timeout=None):
+        self.calls += 1
+        data = data or {}
+        ids = [i for i in self.ids if (data.get("older") is None or i < data["older"]) and
+               (data.get("newer") is None or i > data["newer"])]
+        ids.sort(reverse=data.get("order") != "asc")
+        votes = [{"id": i, "created_at": "2015-06-01T10:00:00.000Z", "post_id": 1, "user_id": i}
+                 for i in ids[:data.get("per_page", 100)]]
+        return Response(200, {}, json.dumps({"votes": votes}).encode())
+
+
+class IncrementalSyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = VotesTransport(100)
+        client = ProductHuntClient("id", "secret", "http://localhost", dev_token="token", transport=self.transport)
+        self.sync = IncrementalSync(client, JSONStore(), per_page=20, raw=True)
+
+    def ids(self, **kwargs):
+        votes, cursor = self.sync.post_votes(1, context="user", **kwargs)
+        return [vote["id"] for vote in votes]
+
+    def test_first_sync_then_only_new_records(self):
+        self.assertEqual(self.ids(), list(range(100, 0, -1)))
+        self.assertEqual(self.ids(), [])
+        self.transport.ids.extend(range(101, 106))
+        self.assertEqual(self.ids(), list(range(105, 100, -1)))
+
+    def test_max_items_only_caps_the_first_sync(self):
+        self.assertEqual(self.ids(max_items=10), list(range(100, 90, -1)))
+        # more records came in than the cap since the mark: none of them may be skipped
+        self.transport.ids.extend(range(101, 251))
+        self.assertEqual(self.ids(max_items=50), list(range(250, 100, -1)))
+        self.assertEqual(self.ids(max_items=50), [])
+
+    def test_uncommitted_cursor(self):
+        votes, cursor = self.sync.post_votes(1, context="user", commit=False)
+        self.assertEqual(len(votes), 100)
+        self.assertIsNone(self.sync.cursor("posts/1/votes"))
+        self.sync.commit("posts/1/votes", cursor)
+        self.assertEqual(self.ids(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()